@@ -0,0 +1,50 @@
+import os
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from .models import RequestProfile
+from .profiling import profile_dir
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'method', 'path', 'view_name', 'status_code', 'duration_ms', 'query_count', 'user', 'downloads')
+    list_filter = ('method', 'status_code', 'view_name')
+    search_fields = ('path', 'view_name', 'user__email')
+    ordering = ('-created_at',)
+    raw_id_fields = ('user',)
+    readonly_fields = [field.name for field in RequestProfile._meta.fields] + ['downloads']
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/<str:kind>/',
+                self.admin_site.admin_view(self.download_view),
+                name='core_requestprofile_download',
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description='Files')
+    def downloads(self, obj):
+        return format_html(
+            '<a href="{}">pstats</a> · <a href="{}">collapsed</a>',
+            reverse('admin:core_requestprofile_download', args=[obj.pk, 'pstats']),
+            reverse('admin:core_requestprofile_download', args=[obj.pk, 'collapsed']),
+        )
+
+    def download_view(self, request, pk, kind):
+        if not self.has_view_permission(request):
+            raise Http404
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        names = {'pstats': profile.pstats_file, 'collapsed': profile.collapsed_file}
+        if kind not in names:
+            raise Http404
+        filename = os.path.join(profile_dir(), names[kind])
+        if not os.path.exists(filename):
+            raise Http404('Profile file has been removed')
+        return FileResponse(open(filename, 'rb'), as_attachment=True, filename=names[kind])
@@ -0,0 +1,24 @@
+from django.apps import AppConfig, apps
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from .cache import invalidate_sender
+        from .db import configure_sqlite
+        from .instrumentation import install_query_recorder
+        from .profiling import remove_profile_files
+
+        connection_created.connect(configure_sqlite, dispatch_uid='core-configure-sqlite')
+        connection_created.connect(install_query_recorder, dispatch_uid='core-query-recorder')
+        post_delete.connect(remove_profile_files, sender='core.RequestProfile', dispatch_uid='core-profile-files')
+
+        for label in getattr(settings, 'RESPONSE_CACHE_MODELS', []):
+            model = apps.get_model(label)
+            post_save.connect(invalidate_sender, sender=model, dispatch_uid=f'response-cache-save-{label}')
+            post_delete.connect(invalidate_sender, sender=model, dispatch_uid=f'response-cache-delete-{label}')
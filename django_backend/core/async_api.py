@@ -0,0 +1,86 @@
+from functools import wraps
+from django.http import Http404, JsonResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .pagination import KeysetPagination, SizedPageNumberPagination
+
+
+class APIResponse(JsonResponse):
+    """``JsonResponse`` that keeps its payload on ``.data`` like DRF's ``Response``."""
+
+    def __init__(self, data, status=200, **kwargs):
+        self.data = data
+        super().__init__(data, status=status, safe=False, **kwargs)
+
+
+def async_api_view(authentication_class):
+    """Turn a coroutine into a GET-only, JWT-authenticated JSON endpoint.
+
+    DRF 3.14 views are synchronous, so this does the parts of ``APIView``
+    the read endpoints rely on: the view receives a DRF ``Request`` (for
+    ``query_params`` and serializer context), ``authentication_class`` must
+    provide an ``aauthenticate(request)`` coroutine, and API exceptions are
+    rendered as ``{"detail": ...}`` responses.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return APIResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            
+            request = Request(request)
+            try:
+                result = await authentication_class().aauthenticate(request)
+                if result is None:
+                    raise exceptions.NotAuthenticated()
+                request.user, request.auth = result
+                return await view_func(request, *args, **kwargs)
+            except Http404:
+                return APIResponse({'detail': 'Not found.'}, status=404)
+            except exceptions.APIException as exc:
+                response = APIResponse({'detail': exc.detail}, status=exc.status_code)
+                if isinstance(exc, exceptions.NotAuthenticated):
+                    response['WWW-Authenticate'] = 'Bearer realm="api"'
+                return response
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+async def apaginate(request, queryset):
+    """Async counterpart of ``OptionalKeysetPagination``.
+
+    Returns ``(rows, envelope)`` where ``envelope`` holds every key of the
+    paginated response except ``results``.
+    """
+    keyset = KeysetPagination()
+    if keyset.cursor_query_param in request.query_params:
+        keyset.request = request
+        page_size = keyset.get_page_size(request)
+        queryset = keyset.page_queryset(queryset, request)
+        rows = keyset.finish_page([row async for row in queryset[:page_size + 1]], page_size)
+        return rows, {'next': keyset.get_next_link(), 'next_cursor': keyset.next_cursor}
+    
+    paginator = SizedPageNumberPagination()
+    page_size = paginator.get_page_size(request)
+    try:
+        page = max(int(request.query_params.get(paginator.page_query_param, 1)), 1)
+    except ValueError:
+        raise exceptions.NotFound('Invalid page.')
+    
+    count = await queryset.acount()
+    start = (page - 1) * page_size
+    if page > 1 and start >= count:
+        raise exceptions.NotFound('Invalid page.')
+    rows = [row async for row in queryset[start:start + page_size]]
+    
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, paginator.page_query_param, page + 1) if start + page_size < count else None
+    if page == 1:
+        previous_url = None
+    elif page == 2:
+        previous_url = remove_query_param(url, paginator.page_query_param)
+    else:
+        previous_url = replace_query_param(url, paginator.page_query_param, page - 1)
+    return rows, {'count': count, 'next': next_url, 'previous': previous_url}
@@ -0,0 +1,217 @@
+import atexit
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework.response import Response
+from . import metrics
+
+
+GENERATION_KEY = 'cachegen:{}'
+STATS_KEY = 'cachestats:{}:{}'
+
+# Lookups counted by this process but not yet added to the shared counters
+_pending_stats = Counter()
+_pending_pid = None
+_pending_flushed = 0.0
+_pending_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def response_ttl(name):
+    """The TTL for cached view ``name``, or None when it isn't cached.
+
+    Generation bumps only reach other workers through a shared cache. With
+    the per-process locmem backend a worker keeps serving what it cached
+    until the entry expires, so TTLs are capped at
+    ``RESPONSE_CACHE_LOCAL_MAX_TTL`` there.
+    """
+    ttl = getattr(settings, 'RESPONSE_CACHE_TTLS', {}).get(name)
+    if ttl and isinstance(get_cache(), LocMemCache):
+        ttl = min(ttl, getattr(settings, 'RESPONSE_CACHE_LOCAL_MAX_TTL', 30))
+    return ttl
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label
+
+
+def model_generations(models):
+    """Return the current generation number of each model, in order."""
+    cache = get_cache()
+    keys = [GENERATION_KEY.format(_label(model)) for model in models]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        # Seed from the clock so a generation is never reused after eviction
+        cache.set_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def model_generation(model):
+    return model_generations([model])[0]
+
+
+def invalidate_model(model):
+    """Bump a model's generation, orphaning every response cached against it."""
+    cache = get_cache()
+    key = GENERATION_KEY.format(_label(model))
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_sender(sender, **kwargs):
+    """``post_save`` / ``post_delete`` receiver that invalidates the sender model."""
+    if kwargs.get('raw'):
+        return
+    # Wait for the commit so a concurrent read can't re-cache the old row
+    transaction.on_commit(lambda: invalidate_model(sender), using=kwargs.get('using'))
+
+
+def record(name, outcome):
+    """Count a lookup; the shared counters are updated every ``RESPONSE_CACHE_STATS_INTERVAL`` seconds."""
+    global _pending_pid, _pending_flushed
+    metrics.inc('skillswap_response_cache_requests_total', view=name, outcome=outcome)
+    now = time.monotonic()
+    with _pending_lock:
+        if _pending_pid != os.getpid():
+            # Counts inherited across a fork belong to the parent
+            _pending_stats.clear()
+            _pending_pid, _pending_flushed = os.getpid(), now
+        _pending_stats[name, outcome] += 1
+        if now - _pending_flushed < getattr(settings, 'RESPONSE_CACHE_STATS_INTERVAL', 10):
+            return
+        _pending_flushed = now
+    flush_stats()
+
+
+def flush_stats():
+    """Add this process's pending lookup counts to the shared counters."""
+    with _pending_lock:
+        if _pending_pid != os.getpid():
+            return
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+    cache = get_cache()
+    for (name, outcome), count in pending.items():
+        key = STATS_KEY.format(name, outcome)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            if not cache.add(key, count, None):
+                cache.incr(key, count)
+
+
+atexit.register(flush_stats)
+
+
+def cache_stats(names):
+    """Return ``{name: {'hits': n, 'misses': n}}`` for the given cached views."""
+    keys = {
+        (name, outcome): STATS_KEY.format(name, outcome)
+        for name in names for outcome in ('hits', 'misses')
+    }
+    values = get_cache().get_many(keys.values())
+    stats = {}
+    for (name, outcome), key in keys.items():
+        stats.setdefault(name, {})[outcome] = values.get(key, 0)
+    return stats
+
+
+def response_cache_key(request, name, scope, generations):
+    user_part = getattr(request.user, 'pk', None) if scope == 'user' else 'shared'
+    raw = f"{request.path}?{request.META.get('QUERY_STRING', '')}"
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"resp:{name}:{user_part}:{digest}:{'.'.join(str(g) for g in generations)}"
+
+
+def cached_render(request, name, scope, depends_on, render):
+    """Serve ``render()``'s response from the cache when possible.
+
+    ``scope`` is ``'shared'`` for responses that are the same for every
+    caller or ``'user'`` for per-user ones. Entries are keyed on the
+    generations of ``depends_on``, so saving or deleting any of those
+    models makes them unreachable. TTLs come from :func:`response_ttl`.
+    """
+    ttl = response_ttl(name)
+    if not ttl or request.method != 'GET':
+        return render()
+    
+    cache = get_cache()
+    key = response_cache_key(request, name, scope, model_generations(depends_on))
+    cached = cache.get(key)
+    if cached is not None:
+        record(name, 'hits')
+        status_code, data = cached
+        return Response(data, status=status_code)
+    
+    record(name, 'misses')
+    response = render()
+    if response.status_code == 200 and hasattr(response, 'data'):
+        cache.set(key, (response.status_code, response.data), ttl)
+    return response
+
+
+async def acached_render(request, name, scope, depends_on, render, response_class):
+    """Async version of :func:`cached_render` for coroutine ``render`` callables.
+
+    Cache hits are rebuilt with ``response_class(data, status=...)``. The
+    cache is called synchronously: the local-memory, file and Redis backends
+    answer in well under a millisecond, whereas their async wrappers would
+    funnel every lookup through the single thread-sensitive executor.
+    """
+    ttl = response_ttl(name)
+    if not ttl or request.method != 'GET':
+        return await render()
+    
+    cache = get_cache()
+    key = response_cache_key(request, name, scope, model_generations(depends_on))
+    cached = cache.get(key)
+    if cached is not None:
+        record(name, 'hits')
+        status_code, data = cached
+        return response_class(data, status=status_code)
+    
+    record(name, 'misses')
+    response = await render()
+    if response.status_code == 200 and hasattr(response, 'data'):
+        cache.set(key, (response.status_code, response.data), ttl)
+    return response
+
+
+def cached_response(name, scope='shared', depends_on=()):
+    """Decorator for ``@api_view`` functions; apply it below the DRF decorators."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return cached_render(
+                request, name, scope, depends_on,
+                lambda: view_func(request, *args, **kwargs),
+            )
+        return wrapper
+    return decorator
+
+
+class CachedResponseMixin:
+    """Generic view mixin that caches GET responses; see :func:`cached_render`."""
+    cache_name = None
+    cache_scope = 'shared'
+    cache_depends_on = ()
+
+    def get(self, request, *args, **kwargs):
+        return cached_render(
+            request, self.cache_name, self.cache_scope, self.cache_depends_on,
+            lambda: super(CachedResponseMixin, self).get(request, *args, **kwargs),
+        )
@@ -0,0 +1,121 @@
+import hashlib
+from functools import wraps
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(request, *parts):
+    """Hash ``parts`` together with the user and query string into an ETag."""
+    user_id = getattr(request.user, 'pk', None)
+    raw = '|'.join(str(part) for part in (request.path, request.META.get('QUERY_STRING', ''), user_id, *parts))
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def queryset_validators(request, queryset, field='updated_at', related=()):
+    """ETag and Last-Modified from one ``MAX``/``COUNT`` aggregate over ``queryset``.
+
+    ``related`` names further timestamps (e.g. ``'requester__updated_at'``)
+    of rows embedded in the response; their ``MAX`` feeds the validators too.
+    """
+    row = queryset.order_by().aggregate(**_validator_aggregates(field, related))
+    return _validators_from_row(request, row)
+
+
+async def aqueryset_validators(request, queryset, field='updated_at', related=()):
+    """Async version of :func:`queryset_validators`."""
+    row = await queryset.order_by().aaggregate(**_validator_aggregates(field, related))
+    return _validators_from_row(request, row)
+
+
+def _validator_aggregates(field, related):
+    fields = (field, *related)
+    return {'count': Count('pk'), **{f'max_{i}': Max(name) for i, name in enumerate(fields)}}
+
+
+def _validators_from_row(request, row):
+    maxima = [row[f'max_{i}'] for i in range(len(row) - 1)]
+    last_modified = max((value for value in maxima if value is not None), default=None)
+    return make_etag(request, *maxima, row['count']), last_modified
+
+
+def conditional_response(request, get_validators, render):
+    """Return 304 when the client's validators match, otherwise ``render()``.
+
+    ``get_validators()`` returns ``(etag, last_modified)``; returning None
+    skips the check (for example when the object doesn't exist).
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return render()
+    
+    validators = get_validators()
+    if validators is None:
+        return render()
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+        if response.status_code != 200:
+            return response
+    return _set_validators(response, etag, timestamp)
+
+
+async def aconditional_response(request, get_validators, render):
+    """Async version of :func:`conditional_response` for coroutine callables."""
+    if request.method not in ('GET', 'HEAD'):
+        return await render()
+    
+    validators = await get_validators()
+    if validators is None:
+        return await render()
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = await render()
+        if response.status_code != 200:
+            return response
+    return _set_validators(response, etag, timestamp)
+
+
+def _set_validators(response, etag, timestamp):
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def condition(get_validators):
+    """Decorator for ``@api_view`` functions; apply it below the DRF decorators.
+
+    ``get_validators(request, *args, **kwargs)`` returns ``(etag, last_modified)``.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return conditional_response(
+                request,
+                lambda: get_validators(request, *args, **kwargs),
+                lambda: view_func(request, *args, **kwargs),
+            )
+        return wrapper
+    return decorator
+
+
+class ConditionalGetMixin:
+    """Generic view mixin that answers unchanged GETs with 304 before serializing."""
+
+    def get_validators(self):
+        """Return ``(etag, last_modified)`` for the current request."""
+        return queryset_validators(self.request, self.filter_queryset(self.get_queryset()))
+
+    def get(self, request, *args, **kwargs):
+        return conditional_response(
+            request,
+            self.get_validators,
+            lambda: super(ConditionalGetMixin, self).get(request, *args, **kwargs),
+        )
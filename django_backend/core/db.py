@@ -0,0 +1,13 @@
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """``connection_created`` receiver applying ``SQLITE_PRAGMAS`` to new SQLite connections."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
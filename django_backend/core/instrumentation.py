@@ -0,0 +1,169 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from django.conf import settings
+from . import metrics as prometheus
+
+
+logger = logging.getLogger('core.requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+# Placeholder runs from IN (...) lists and VALUES rows, so batches of any size share a shape
+_PLACEHOLDER_RUN = re.compile(r'%s(?:\s*,\s*%s)+')
+_VALUES_RUN = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+_NUMBER = re.compile(r'\b\d+\b')
+
+
+def sql_shape(sql):
+    """Normalise ``sql`` so queries differing only in literals or list sizes compare equal."""
+    shape = _PLACEHOLDER_RUN.sub('...', sql)
+    shape = shape.replace('(%s)', '(...)')
+    shape = _VALUES_RUN.sub(r'\1', shape)
+    return _NUMBER.sub('?', shape)
+
+
+class RequestMetrics:
+    """Query and timing totals for the request running in this context."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+        self.timers = Counter()
+
+    def record_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        self.shapes[sql_shape(sql)] += 1
+
+    def repeated_queries(self, threshold):
+        """``(shape, count)`` pairs issued more than ``threshold`` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def summary(self, finished):
+        view_time = finished - self.view_started if self.view_started is not None else None
+        durations = {
+            'total': finished - self.started,
+            'view': view_time,
+            'db': self.db_time,
+            **self.timers,
+        }
+        return {name: round(value * 1000, 2) for name, value in durations.items() if value is not None}
+
+
+@contextmanager
+def collect():
+    """Record metrics for everything run inside the block, including async work spawned from it."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def timer(name):
+    """Add the time spent in the block to the current request's ``name`` timer."""
+    metrics = _current.get()
+    if metrics is None:
+        return nullcontext()
+    return _timed(metrics, name)
+
+
+@contextmanager
+def _timed(metrics, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timers[name] += time.perf_counter() - started
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper crediting each query to the request that issued it."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver hooking ``record_query`` into every connection.
+
+    Installed per connection rather than per request so queries from the
+    threads ``sync_to_async`` runs the ORM in are counted as well.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    return match.view_name or match._func_path
+
+
+def server_timing(metrics, durations):
+    entries = []
+    for name, duration in durations.items():
+        entry = f'{name};dur={duration}'
+        if name == 'db':
+            entry += f';desc="{metrics.queries} queries"'
+        entries.append(entry)
+    return ', '.join(entries)
+
+
+def report(request, response, metrics):
+    """Log the request's metrics, add them to ``/api/metrics`` and ``Server-Timing``, flag repeated queries."""
+    durations = metrics.summary(time.perf_counter())
+    view = view_name(request)
+    if getattr(settings, 'REQUEST_TIMING_HEADERS', False):
+        response['Server-Timing'] = server_timing(metrics, durations)
+
+    logger.info(json.dumps({
+        'event': 'request',
+        'method': request.method,
+        'path': request.path,
+        'view': view,
+        'status': response.status_code,
+        'queries': metrics.queries,
+        **{f'{name}_ms': duration for name, duration in durations.items()},
+    }))
+
+    record_metrics(request, response, metrics, view or 'unmatched')
+
+    threshold = getattr(settings, 'N_PLUS_ONE_THRESHOLD', 10)
+    for shape, count in metrics.repeated_queries(threshold):
+        logger.warning(json.dumps({
+            'event': 'n_plus_one',
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'count': count,
+            'sql': shape,
+        }))
+
+
+def record_metrics(request, response, metrics, view):
+    """Feed the request into the ``/api/metrics`` counters and histograms."""
+    elapsed = time.perf_counter() - metrics.started
+    prometheus.inc('skillswap_http_requests_total', view=view, method=request.method, status=response.status_code)
+    prometheus.observe('skillswap_http_request_duration_seconds', elapsed, prometheus.LATENCY_BUCKETS, view=view)
+    prometheus.observe('skillswap_db_queries_per_request', metrics.queries, prometheus.QUERY_COUNT_BUCKETS, view=view)
+    prometheus.observe('skillswap_db_duration_seconds', metrics.db_time, prometheus.DB_TIME_BUCKETS, view=view)
@@ -0,0 +1,154 @@
+import asyncio
+import statistics
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+from core.management.utils import request_host
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+
+DEFAULT_ENDPOINTS = [
+    ('/api/skills/', '/api/async/skills/'),
+    ('/api/skills/popular/', '/api/async/skills/popular/'),
+    ('/api/skills/categories/', '/api/async/skills/categories/'),
+    ('/swaps/my-requests/', '/api/async/swaps/my-requests/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the WSGI application on the sync endpoints with '
+        'the ASGI application on their async versions, in-process and at a '
+        'fixed concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and mode')
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--user', help='Username to authenticate as (default: first active user)')
+        parser.add_argument('--endpoint', action='append', metavar='SYNC_PATH=ASYNC_PATH',
+                            help='Endpoint pair to compare; may be repeated')
+        parser.add_argument('--no-cache', action='store_true', help='Disable the response cache while benchmarking')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['user']:
+            users = users.filter(username=options['user'])
+        user = users.order_by('id').first()
+        if user is None:
+            raise CommandError('No active user to authenticate as; create one or run seed data first')
+        
+        endpoints = DEFAULT_ENDPOINTS
+        if options['endpoint']:
+            try:
+                endpoints = [tuple(pair.split('=', 1)) for pair in options['endpoint']]
+            except ValueError:
+                raise CommandError('--endpoint must look like /sync/path/=/async/path/')
+        
+        headers = {'authorization': f'Bearer {AccessToken.for_user(user)}'}
+        total, concurrency = options['requests'], options['concurrency']
+        host = request_host()
+        failed = []
+        
+        with override_settings(RESPONSE_CACHE_TTLS={}) if options['no_cache'] else nullcontext():
+            wsgi, asgi = get_wsgi_application(), get_asgi_application()
+            self.stdout.write(f"{'mode':<5} {'path':<36} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6}")
+            for sync_path, async_path in endpoints:
+                for mode, path, runner in (
+                    ('wsgi', sync_path, lambda p: run_wsgi(wsgi, p, host, headers, total, concurrency)),
+                    ('asgi', async_path, lambda p: asyncio.run(run_asgi(asgi, p, host, headers, total, concurrency))),
+                ):
+                    elapsed, latencies, errors = runner(path)
+                    latencies.sort()
+                    self.stdout.write(
+                        f'{mode:<5} {path:<36} {total / elapsed:>8.1f} '
+                        f'{statistics.median(latencies) * 1000:>8.1f} '
+                        f'{latencies[int(len(latencies) * 0.95) - 1] * 1000:>8.1f} {errors:>6}'
+                    )
+                    if errors:
+                        failed.append(f'{mode} {path}: {errors} of {total}')
+        
+        # Throughput of error responses says nothing about the endpoint
+        if failed:
+            raise CommandError('Requests failed (non-2xx/3xx):\n  ' + '\n  '.join(failed))
+
+
+def _split_path(path):
+    path, _, query = path.partition('?')
+    return path, query
+
+
+def run_wsgi(application, path, host, headers, total, concurrency):
+    """Call the WSGI app from ``concurrency`` threads, like a threaded server would."""
+    path, query = _split_path(path)
+    
+    def one(_):
+        environ = {
+            'PATH_INFO': path, 'QUERY_STRING': query, 'REQUEST_METHOD': 'GET',
+            'SERVER_NAME': host, 'HTTP_HOST': host,
+        }
+        for name, value in headers.items():
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+        setup_testing_defaults(environ)
+        statuses = []
+        started = time.perf_counter()
+        body = application(environ, lambda status, response_headers, exc_info=None: statuses.append(status))
+        try:
+            for _chunk in body:
+                pass
+        finally:
+            body.close()
+        return time.perf_counter() - started, 200 <= int(statuses[0].split()[0]) < 400
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    return elapsed, [latency for latency, _ok in results], sum(1 for _latency, ok in results if not ok)
+
+
+async def run_asgi(application, path, host, headers, total, concurrency):
+    """Drive the ASGI app with ``concurrency`` requests in flight on one event loop."""
+    path, query = _split_path(path)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', host.encode())] + [(name.encode(), value.encode()) for name, value in headers.items()],
+        'client': ('127.0.0.1', 0), 'server': (host, 80),
+    }
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        async with semaphore:
+            sent_body = False
+            disconnected = asyncio.Event()
+            status = []
+            
+            async def receive():
+                nonlocal sent_body
+                if not sent_body:
+                    sent_body = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+            
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+            
+            started = time.perf_counter()
+            await application(dict(scope), receive, send)
+            disconnected.set()
+            return time.perf_counter() - started, bool(status) and 200 <= status[0] < 400
+    
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    return elapsed, [latency for latency, _ok in results], sum(1 for _latency, ok in results if not ok)
@@ -0,0 +1,229 @@
+import json
+import platform
+import statistics
+import time
+from collections import Counter
+from contextlib import ExitStack, nullcontext
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.tokens import AccessToken
+from core.management.utils import request_host
+from skills.models import Skill
+from swaps.models import SwapRating, SwapRequest
+from users.models import User
+
+
+URL_MODULES = ['users.urls', 'skills.urls', 'swaps.urls']
+
+
+class Fixtures:
+    """Ids the benchmark plugs into URLs and payloads, picked from existing data."""
+
+    def __init__(self, user):
+        self.user = user
+        received = SwapRequest.objects.filter(recipient=user, status='pending').order_by('-created_at')
+        self.pending_received = list(received.values_list('id', flat=True)[:20])
+        self.accepted_sent = SwapRequest.objects.filter(requester=user, status='accepted').values_list('id', flat=True).first()
+        self.any_swap = SwapRequest.objects.involving(user).values_list('id', flat=True).first()
+        self.rating = SwapRating.objects.filter(rater=user).values_list('id', flat=True).first()
+        self.other_user = User.objects.exclude(pk=user.pk).values_list('id', flat=True).first()
+        self.skill = Skill.objects.values_list('id', flat=True).first()
+        rated = SwapRating.objects.filter(rater=user).values('swap_request_id')
+        self.unrated = [
+            {'swap_request': pk, 'rated_user': requester_id if recipient_id == user.pk else recipient_id, 'rating': 5}
+            for pk, requester_id, recipient_id in (
+                SwapRequest.objects.involving(user).filter(status='completed')
+                .exclude(id__in=rated)
+                .values_list('id', 'requester_id', 'recipient_id')[:5]
+            )
+        ]
+
+
+def endpoint_specs(fixtures):
+    """``{url name: (method, kwargs, payload)}``; names not listed are plain GETs.
+
+    A None kwarg or POST payload means the database has nothing suitable and
+    the endpoint is reported as skipped.
+    """
+    first_pending = fixtures.pending_received[0] if fixtures.pending_received else None
+    return {
+        'skill-detail': ('GET', {'pk': fixtures.skill}, None),
+        'request-skill': ('POST', {}, {'skill': 'Benchmark Skill'}),
+        'swap-detail': ('GET', {'pk': fixtures.any_swap}, None),
+        'accept-swap': ('POST', {'pk': first_pending}, {}),
+        'reject-swap': ('POST', {'pk': first_pending}, {}),
+        'complete-swap': ('POST', {'pk': fixtures.accepted_sent}, {}),
+        'swap-bulk-transition': ('POST', {}, {'ids': fixtures.pending_received, 'status': 'accepted'} if first_pending else None),
+        'rating-bulk-create': ('POST', {}, fixtures.unrated or None),
+        'rating-detail': ('GET', {'pk': fixtures.rating}, None),
+        'create_swap_request': ('GET', {'user_id': fixtures.other_user}, None),
+    }
+
+
+def url_names():
+    names = []
+    for module in URL_MODULES:
+        for pattern in import_string(f'{module}.urlpatterns'):
+            if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in names:
+                names.append(pattern.name)
+    return names
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every URL in users/, skills/ and swaps/urls.py against the '
+        'current database and report p50/p95 latency and SQL query counts as JSON. '
+        'Write requests run inside a rolled-back transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--user', help='Username to benchmark as (default: the busiest user)')
+        parser.add_argument('--no-cache', action='store_true', help='Disable the response cache')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--compare', metavar='BASELINE', help='Compare with an earlier JSON report')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 growth against the baseline (default 0.25 = 25%%)')
+
+    def handle(self, *args, **options):
+        user = self.pick_user(options['user'])
+        fixtures = Fixtures(user)
+        specs = endpoint_specs(fixtures)
+        
+        # JWT for the API views, a session for the login_required HTML pages
+        client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}',
+            SERVER_NAME=request_host(),
+            raise_request_exception=False,
+        )
+        client.force_login(user)
+        results = []
+        with override_settings(RESPONSE_CACHE_TTLS={}) if options['no_cache'] else nullcontext():
+            for name in url_names():
+                method, kwargs, payload = specs.get(name, ('GET', {}, None))
+                if None in kwargs.values() or (method == 'POST' and payload is None):
+                    results.append({'name': name, 'skipped': 'no suitable data'})
+                    continue
+                path = reverse(name, kwargs=kwargs)
+                results.append(self.measure(client, user, name, method, path, payload, options))
+        
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'user': user.username,
+                'iterations': options['iterations'],
+                'response_cache': not options['no_cache'],
+                'rows': {
+                    'users': User.objects.count(),
+                    'swap_requests': SwapRequest.objects.count(),
+                    'ratings': SwapRating.objects.count(),
+                },
+            },
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        else:
+            self.stdout.write(output)
+        
+        # Timings of error responses say nothing about the endpoint; don't let them pass as a result
+        failed = [
+            f"{entry['name']}: HTTP {', '.join(map(str, entry['error_statuses']))}"
+            for entry in results if entry.get('error_statuses')
+        ]
+        if failed:
+            raise CommandError('Endpoints returned errors:\n  ' + '\n  '.join(failed))
+        
+        if options['compare']:
+            self.compare(report, options['compare'], options['tolerance'])
+
+    def pick_user(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f'No user named {username!r}')
+            return user
+        # The user with the most pending requests exercises the heaviest paths
+        user = (
+            User.objects.filter(is_active=True)
+            .annotate(pending=Count('received_requests', filter=Q(received_requests__status='pending')))
+            .order_by('-pending', 'id')
+            .first()
+        )
+        if user is None:
+            raise CommandError('The database has no users; run seed_load first')
+        return user
+
+    def measure(self, client, user, name, method, path, payload, options):
+        timings, query_counts, statuses = [], [], Counter()
+        for iteration in range(options['warmup'] + options['iterations']):
+            with ExitStack() as stack:
+                if method != 'GET':
+                    # Keep the data identical between iterations
+                    stack.enter_context(transaction.atomic())
+                if name == 'logout':
+                    client.force_login(user)
+                captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                started = time.perf_counter()
+                if method == 'GET':
+                    response = client.get(path)
+                else:
+                    response = client.post(path, payload, content_type='application/json')
+                elapsed = time.perf_counter() - started
+                if method != 'GET':
+                    transaction.set_rollback(True)
+            if iteration < options['warmup']:
+                continue
+            timings.append(elapsed * 1000)
+            query_counts.append(sum(len(capture) for capture in captures))
+            statuses[response.status_code] += 1
+        if name == 'logout':
+            client.force_login(user)
+        
+        return {
+            'name': name,
+            'method': method,
+            'path': path,
+            'status': statuses.most_common(1)[0][0],
+            'error_statuses': sorted(code for code in statuses if not 200 <= code < 400),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'queries': max(query_counts),
+        }
+
+    def compare(self, report, baseline_path, tolerance):
+        with open(baseline_path) as handle:
+            baseline = {entry['name']: entry for entry in json.load(handle)['endpoints'] if 'p95_ms' in entry}
+        
+        regressions = []
+        for entry in report['endpoints']:
+            before = baseline.get(entry['name'])
+            if before is None or 'p95_ms' not in entry:
+                continue
+            if entry['queries'] > before['queries']:
+                regressions.append(f"{entry['name']}: queries {before['queries']} -> {entry['queries']}")
+            if entry['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{entry['name']}: p95 {before['p95_ms']}ms -> {entry['p95_ms']}ms")
+        
+        if regressions:
+            raise CommandError('Regressions against baseline:\n  ' + '\n  '.join(regressions))
+        self.stderr.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
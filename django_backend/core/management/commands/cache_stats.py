@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.cache import cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show response cache hit/miss counters per cached view.'
+
+    def handle(self, *args, **options):
+        names = sorted(getattr(settings, 'RESPONSE_CACHE_TTLS', {}))
+        for name, stats in cache_stats(names).items():
+            total = stats['hits'] + stats['misses']
+            ratio = stats['hits'] / total if total else 0.0
+            self.stdout.write(f"{name:<20} hits={stats['hits']:<8} misses={stats['misses']:<8} ratio={ratio:.1%}")
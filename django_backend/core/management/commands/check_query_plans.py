@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.query_plans import check_query_plans, hot_views
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the hot API views against throwaway data, EXPLAIN every SELECT they '
+        'issue and fail if any of them falls back to a full table scan.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not only failures')
+
+    def handle(self, *args, **options):
+        failures = check_query_plans(show_plans=options['show_plans'], write=self.stdout.write)
+        if failures:
+            raise CommandError('Query plan regressions:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS(f'{len(hot_views())} views checked, no full scans'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.metrics import clear, metrics_dir
+
+
+class Command(BaseCommand):
+    help = 'Delete the per-worker metrics files; run before starting the server.'
+
+    def handle(self, *args, **options):
+        clear()
+        self.stdout.write(self.style.SUCCESS(f'Cleared metrics in {metrics_dir()}'))
@@ -0,0 +1,168 @@
+import random
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from core.cache import invalidate_model
+from skills.models import Skill, SkillRequest
+from swaps.models import SwapRating, SwapRequest
+from users.models import Profile, User
+
+
+SEED_DOMAIN = 'seed.example.com'
+
+SKILL_WORDS = {
+    'technology': ['Python', 'JavaScript', 'Rust', 'SQL', 'Docker', 'Linux', 'React', 'Go'],
+    'design': ['Figma', 'Typography', 'Illustration', 'UX Research', 'Branding'],
+    'creative': ['Photography', 'Pottery', 'Writing', 'Knitting', 'Video Editing'],
+    'languages': ['Spanish', 'French', 'Japanese', 'German', 'Mandarin', 'Arabic'],
+    'business': ['Marketing', 'Accounting', 'Negotiation', 'Public Speaking'],
+    'health': ['Yoga', 'Meditation', 'Nutrition', 'First Aid'],
+    'sports': ['Running', 'Climbing', 'Tennis', 'Swimming', 'Chess'],
+    'cooking': ['Baking', 'Sushi', 'Fermentation', 'Vegan Cooking'],
+    'music': ['Guitar', 'Piano', 'Singing', 'Drums', 'Music Theory'],
+    'other': ['Gardening', 'Woodworking', 'Sewing', 'Calligraphy'],
+}
+LOCATIONS = ['Berlin', 'Lisbon', 'Nairobi', 'Toronto', 'Seoul', 'Austin', 'Lima', 'Remote']
+# Rough share of each status among generated swap requests
+STATUS_WEIGHTS = {'pending': 4, 'accepted': 2, 'rejected': 2, 'completed': 3}
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic users, skills, swap requests (in every status) and '
+        'ratings with bulk_create, then rebuild every derived table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--skills', type=int, default=200)
+        parser.add_argument('--requests-per-user', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
+        parser.add_argument('--password', default='seed-password', help='Password for every generated user')
+        parser.add_argument('--flush', action='store_true', help=f'Delete previously seeded @{SEED_DOMAIN} users first')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        seeded = User.objects.filter(email__endswith=f'@{SEED_DOMAIN}')
+        if seeded.exists():
+            if not options['flush']:
+                raise CommandError('Seed users already exist; pass --flush to replace them')
+            deleted, _ = seeded.delete()
+            self.stdout.write(f'Deleted {deleted} seeded rows')
+        
+        with transaction.atomic():
+            skill_names = self.create_skills(rng, options['skills'], batch_size)
+            users = self.create_users(rng, options['users'], skill_names, options['password'], batch_size)
+            swaps = self.create_swaps(rng, users, options['requests_per_user'], batch_size)
+            ratings = self.create_ratings(rng, swaps, batch_size)
+            self.create_skill_requests(rng, users, batch_size)
+        
+        self.stdout.write(
+            f'Created {len(users)} users, {len(skill_names)} skills, '
+            f'{len(swaps)} swap requests and {ratings} ratings'
+        )
+        
+        # bulk_create skips signals and save(), so rebuild what they maintain
+        for command in ('sync_user_skills', 'rebuild_skill_popularity', 'rebuild_skill_matches',
+                        'recompute_ratings', 'rebuild_search_index'):
+            self.stdout.write(f'Running {command}...')
+            call_command(command, stdout=self.stdout)
+        for model in (User, Skill, SwapRequest, SwapRating):
+            invalidate_model(model)
+        self.stdout.write(self.style.SUCCESS('Seed data loaded'))
+
+    def create_skills(self, rng, count, batch_size):
+        existing = set(Skill.objects.values_list('name', flat=True))
+        candidates = [(word, category) for category, words in SKILL_WORDS.items() for word in words]
+        skills = []
+        level = 0
+        while len(existing) < count:
+            for word, category in candidates:
+                name = word if level == 0 else f'{word} {level + 1}'
+                if name not in existing:
+                    skills.append(Skill(name=name, category=category, description=f'Learn {name.lower()}'))
+                    existing.add(name)
+                if len(existing) >= count:
+                    break
+            level += 1
+        Skill.objects.bulk_create(skills, batch_size=batch_size)
+        return sorted(existing)
+
+    def create_users(self, rng, count, skill_names, password, batch_size):
+        # Hashing once keeps a 100k-user seed from spending minutes in PBKDF2
+        password = make_password(password)
+        start = User.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        users = []
+        for index in range(start + 1, start + count + 1):
+            offered = rng.sample(skill_names, k=min(len(skill_names), rng.randint(1, 5)))
+            wanted = rng.sample(skill_names, k=min(len(skill_names), rng.randint(1, 5)))
+            users.append(User(
+                username=f'seed{index}', email=f'seed{index}@{SEED_DOMAIN}', password=password,
+                first_name=f'Seed{index}', last_name='User', location=rng.choice(LOCATIONS),
+                bio=f'Happy to teach {", ".join(offered)}.',
+                skills_offered=offered, skills_wanted=wanted,
+                is_available=rng.random() < 0.8,
+            ))
+        users = User.objects.bulk_create(users, batch_size=batch_size)
+        if users and users[0].pk is None:
+            users = list(User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').order_by('id'))
+        Profile.objects.bulk_create([
+            Profile(
+                user=user, bio=user.bio,
+                skills_offered=', '.join(user.skills_offered)[:255],
+                skills_wanted=', '.join(user.skills_wanted)[:255],
+            )
+            for user in users
+        ], batch_size=batch_size)
+        return users
+
+    def create_swaps(self, rng, users, per_user, batch_size):
+        if len(users) < 2:
+            return []
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        swaps = []
+        for requester in users:
+            # Sample one extra so dropping the requester still leaves per_user recipients
+            recipients = [user for user in rng.sample(users, k=min(per_user + 1, len(users))) if user is not requester]
+            for recipient in recipients[:per_user]:
+                swaps.append(SwapRequest(
+                    requester=requester, recipient=recipient,
+                    requested_skill=rng.choice(recipient.skills_offered),
+                    offered_skill=rng.choice(requester.skills_offered),
+                    message='Want to swap?',
+                    status=rng.choices(statuses, weights)[0],
+                ))
+        swaps = SwapRequest.objects.bulk_create(swaps, batch_size=batch_size)
+        if swaps and swaps[0].pk is None:
+            swaps = list(SwapRequest.objects.filter(requester__email__endswith=f'@{SEED_DOMAIN}'))
+        return swaps
+
+    def create_ratings(self, rng, swaps, batch_size):
+        ratings = []
+        for swap in swaps:
+            if swap.status != 'completed':
+                continue
+            ratings.append(SwapRating(
+                swap_request=swap, rater=swap.requester, rated_user=swap.recipient,
+                rating=rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 5])[0], comment='Great swap',
+            ))
+            if rng.random() < 0.7:
+                ratings.append(SwapRating(
+                    swap_request=swap, rater=swap.recipient, rated_user=swap.requester,
+                    rating=rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 5])[0],
+                ))
+        SwapRating.objects.bulk_create(ratings, batch_size=batch_size)
+        return len(ratings)
+
+    def create_skill_requests(self, rng, users, batch_size):
+        skills = list(Skill.objects.values_list('id', flat=True))
+        requests = [
+            SkillRequest(skill_id=skill_id, requester=user)
+            for user in users if rng.random() < 0.3
+            for skill_id in rng.sample(skills, k=min(2, len(skills)))
+        ]
+        SkillRequest.objects.bulk_create(requests, batch_size=batch_size)
@@ -0,0 +1,34 @@
+import sqlite3
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from core.routers import replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database onto every SQLite replica. Meant for '
+        'local stand-in replicas; real replicas are fed by the database server.'
+    )
+
+    def handle(self, *args, **options):
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('The primary is not SQLite; use the server\'s replication instead')
+        
+        aliases = replica_aliases()
+        if not aliases:
+            self.stdout.write('No replicas configured (set DATABASE_REPLICA_URLS)')
+            return
+        
+        primary.ensure_connection()
+        for alias in aliases:
+            replica = connections[alias]
+            if replica.vendor != 'sqlite':
+                self.stdout.write(self.style.WARNING(f'Skipping {alias}: not SQLite'))
+                continue
+            replica.close()
+            # The online backup API copies a consistent snapshot without locking writers out
+            with sqlite3.connect(replica.settings_dict['NAME']) as target:
+                primary.connection.backup(target)
+            target.close()
+            self.stdout.write(self.style.SUCCESS(f'Copied default -> {alias}'))
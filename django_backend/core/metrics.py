@@ -0,0 +1,246 @@
+"""
+Prometheus metrics shared across worker processes.
+
+Each process writes its samples to its own memory-mapped file in
+``METRICS_DIR``. Values are updated in place, so recording a sample costs
+no system call. ``/api/metrics`` sums the files of every worker, past and
+present, into the Prometheus text format. Counters therefore stay monotonic
+when a worker is recycled. Empty the directory when the server is
+(re)started, e.g. with ``python manage.py clear_metrics``.
+"""
+import glob
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# name -> (type, help); every recorded sample must belong to one of these
+METRICS = {
+    'skillswap_http_requests_total': ('counter', 'Requests handled, by URL name, method and status.'),
+    'skillswap_http_request_duration_seconds': ('histogram', 'Request latency by URL name.'),
+    'skillswap_db_queries_per_request': ('histogram', 'SQL queries issued per request, by URL name.'),
+    'skillswap_db_duration_seconds': ('histogram', 'Time spent in SQL per request, by URL name.'),
+    'skillswap_response_cache_requests_total': ('counter', 'Response cache lookups, by view and outcome.'),
+    'skillswap_response_cache_hit_ratio': ('gauge', 'Share of response cache lookups served from cache.'),
+    'skillswap_users_registered_total': ('counter', 'Users created.'),
+    'skillswap_swaps_created_total': ('counter', 'Swap requests created.'),
+    'skillswap_swap_transitions_total': ('counter', 'Swap requests moved to a new status.'),
+    'skillswap_ratings_submitted_total': ('counter', 'Swap ratings submitted.'),
+}
+
+_HEADER = struct.Struct('i4x')
+_LENGTH = struct.Struct('i')
+_VALUE = struct.Struct('d')
+_INITIAL_SIZE = 64 * 1024
+_LE_LABEL = re.compile(r'le="([^"]*)",?')
+
+
+def metrics_dir():
+    directory = getattr(settings, 'METRICS_DIR', None) or os.path.join(tempfile.gettempdir(), 'skillswap-metrics')
+    return str(directory)
+
+
+def _padded(length):
+    # Keep every value 8-byte aligned so it is written in one store
+    return length + (-length % 8)
+
+
+def _read_entries(data):
+    """Yield ``(key, value, value_offset)`` for each entry in a metrics file's bytes."""
+    used = _HEADER.unpack_from(data, 0)[0]
+    position = _HEADER.size
+    while position < used:
+        length = _LENGTH.unpack_from(data, position)[0]
+        key_start = position + _LENGTH.size
+        value_offset = key_start + _padded(length + _LENGTH.size) - _LENGTH.size
+        key = bytes(data[key_start:key_start + length]).decode('utf-8')
+        yield key, _VALUE.unpack_from(data, value_offset)[0], value_offset
+        position = value_offset + _VALUE.size
+
+
+class MmapStore:
+    """One process's samples: ``key -> float`` in an append-only memory-mapped file.
+
+    Layout: an 8-byte header holding the used length, then entries of key length, UTF-8
+    key padded to 8 bytes and a float64 value. A new entry is written in full
+    before the header is advanced, so readers never see half an entry.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        self._offsets = {key: offset for key, _, offset in _read_entries(self._map)}
+
+    def add(self, key, amount):
+        with self._lock:
+            offset = self._offsets.get(key)
+            if offset is None:
+                offset = self._append(key)
+            value = _VALUE.unpack_from(self._map, offset)[0]
+            _VALUE.pack_into(self._map, offset, value + amount)
+
+    def _append(self, key):
+        encoded = key.encode('utf-8')
+        entry_size = _padded(len(encoded) + _LENGTH.size) + _VALUE.size
+        while self._used + entry_size > len(self._map):
+            self._grow()
+        _LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[self._used + _LENGTH.size:self._used + _LENGTH.size + len(encoded)] = encoded
+        offset = self._used + entry_size - _VALUE.size
+        _VALUE.pack_into(self._map, offset, 0.0)
+        self._used += entry_size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def _grow(self):
+        size = len(self._map) * 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+
+_store = None
+_store_pid = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """This process's store, reopened after a fork so workers never share a file."""
+    global _store, _store_pid
+    pid = os.getpid()
+    if _store_pid != pid:
+        with _store_lock:
+            if _store_pid != pid:
+                directory = metrics_dir()
+                os.makedirs(directory, exist_ok=True)
+                _store = MmapStore(os.path.join(directory, f'metrics_{pid}.db'))
+                _store_pid = pid
+    return _store
+
+
+def enabled():
+    return getattr(settings, 'METRICS_ENABLED', True)
+
+
+def sample_key(name, labels):
+    if not labels:
+        return name
+    rendered = ','.join(f'{label}="{_escape(value)}"' for label, value in sorted(labels.items()))
+    return f'{name}{{{rendered}}}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def inc(name, amount=1, **labels):
+    """Increment counter ``name``."""
+    if enabled() and amount:
+        get_store().add(sample_key(name, labels), amount)
+
+
+def observe(name, value, buckets, **labels):
+    """Record ``value`` in histogram ``name`` with the given upper ``buckets``."""
+    if not enabled():
+        return
+    store = get_store()
+    for bound in buckets:
+        if value <= bound:
+            store.add(sample_key(f'{name}_bucket', {**labels, 'le': _format(bound)}), 1)
+    store.add(sample_key(f'{name}_bucket', {**labels, 'le': '+Inf'}), 1)
+    store.add(sample_key(f'{name}_sum', labels), value)
+    store.add(sample_key(f'{name}_count', labels), 1)
+
+
+def _format(value):
+    return repr(float(value))
+
+
+def collect():
+    """Sum every worker's samples into ``{key: value}``."""
+    totals = {}
+    for path in glob.glob(os.path.join(metrics_dir(), 'metrics_*.db')):
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        if len(data) < _HEADER.size:
+            continue
+        for key, value, _ in _read_entries(data):
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def _family(key):
+    name = key.split('{', 1)[0]
+    if name not in METRICS:
+        for suffix in ('_bucket', '_sum', '_count'):
+            if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+                return name[:-len(suffix)]
+    return name
+
+
+def cache_hit_ratios(totals):
+    """Derive ``skillswap_response_cache_hit_ratio`` samples from the lookup counters."""
+    lookups = {}
+    prefix = 'skillswap_response_cache_requests_total{'
+    for key, value in totals.items():
+        if key.startswith(prefix):
+            labels = dict(part.split('=', 1) for part in key[len(prefix):-1].split(','))
+            counts = lookups.setdefault(labels['view'].strip('"'), {})
+            counts[labels['outcome'].strip('"')] = value
+    return {
+        sample_key('skillswap_response_cache_hit_ratio', {'view': view}): counts.get('hits', 0) / sum(counts.values())
+        for view, counts in lookups.items() if sum(counts.values())
+    }
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    totals = collect()
+    totals.update(cache_hit_ratios(totals))
+    families = {}
+    for key, value in totals.items():
+        families.setdefault(_family(key), []).append((key, value))
+
+    lines = []
+    for name in sorted(families):
+        kind, help_text = METRICS.get(name, ('untyped', ''))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key, value in sorted(families[name], key=_sort_key):
+            lines.append(f'{key} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _sort_key(sample):
+    # Group each label set's buckets together, numerically ordered with +Inf last
+    match = _LE_LABEL.search(sample[0])
+    if match is None:
+        return (sample[0], 0.0)
+    bound = match.group(1)
+    return (_LE_LABEL.sub('', sample[0]), float('inf') if bound == '+Inf' else float(bound))
+
+
+def _format_value(value):
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def clear():
+    """Delete every worker's metrics file (run before the workers start)."""
+    global _store_pid
+    for path in glob.glob(os.path.join(metrics_dir(), 'metrics_*.db')):
+        os.remove(path)
+    _store_pid = None
@@ -0,0 +1,103 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from . import instrumentation, profiling
+from .routers import replica_reads
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaReadsMiddleware:
+    """Let safe requests read from replicas; unsafe ones stay on the primary."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_reads(request.method in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with replica_reads(request.method in SAFE_METHODS):
+            return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """Count queries and time each request; see ``core.instrumentation``."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with instrumentation.collect() as metrics:
+            response = self.get_response(request)
+            instrumentation.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        with instrumentation.collect() as metrics:
+            response = await self.get_response(request)
+            instrumentation.report(request, response, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+
+class ProfilingMiddleware:
+    """Profile requests from staff users that ask for it; see ``core.profiling``."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user = self._profiling_user(request)
+        if user is None or not profiling.profiler_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            with profiling.profiled() as result:
+                response = self.get_response(request)
+            response['X-Profile-Id'] = profiling.save_profile(request, response, user, result).pk
+        finally:
+            profiling.profiler_lock.release()
+        return response
+
+    async def __acall__(self, request):
+        user = await sync_to_async(self._profiling_user)(request) if profiling.requested(request) else None
+        if user is None or not profiling.profiler_lock.acquire(blocking=False):
+            return await self.get_response(request)
+        try:
+            # Only the event loop thread is profiled; ORM calls run in worker threads
+            with profiling.profiled() as result:
+                response = await self.get_response(request)
+            profile = await sync_to_async(profiling.save_profile)(request, response, user, result)
+            response['X-Profile-Id'] = profile.pk
+        finally:
+            profiling.profiler_lock.release()
+        return response
+
+    @staticmethod
+    def _profiling_user(request):
+        if not profiling.requested(request):
+            return None
+        return profiling.profiling_user(request)
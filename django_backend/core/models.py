@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """A profiled request; the profiler output lives in files under ``PROFILE_DIR``."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='request_profiles'
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField(null=True)
+    pstats_file = models.CharField(max_length=255)
+    collapsed_file = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='requestprofile_created'),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,132 @@
+import base64
+from collections import OrderedDict
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only keyset pagination on ``(created_at, id)``, newest first.
+
+    Each page is a single indexed range read, so page 1000 costs the same
+    as page 1 and no ``COUNT(*)`` is ever run.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+    ranked_message = 'Cursor pagination cannot keep search relevance order; use ?page= with ?search='
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def encode_cursor(self, instance):
+        raw = f'{instance.created_at.isoformat()}|{instance.pk}'
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        rows = list(self.page_queryset(queryset, request)[:page_size + 1])
+        return self.finish_page(rows, page_size)
+
+    def page_queryset(self, queryset, request):
+        """Order ``queryset`` and restrict it to rows after the request's cursor."""
+        if 'search_rank' in queryset.query.annotations:
+            # Re-ordering by (created_at, id) would silently drop the ranking
+            raise ValidationError({self.cursor_query_param: [self.ranked_message]})
+        queryset = queryset.order_by(*self.ordering)
+        cursor = self.decode_cursor(request)
+        if cursor:
+            created_at, pk = cursor
+            # Written as a range on created_at so the composite index is used
+            queryset = queryset.filter(
+                Q(created_at__lte=created_at) & ~Q(created_at=created_at, id__gte=pk)
+            )
+        return queryset
+
+    def finish_page(self, rows, page_size):
+        """Trim the look-ahead row fetched past ``page_size`` and set the next cursor."""
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('next_cursor', self.next_cursor),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class SizedPageNumberPagination(PageNumberPagination):
+    """Page-number pagination that honours ``?page_size=`` like :class:`KeysetPagination`."""
+    page_size_query_param = KeysetPagination.page_size_query_param
+    max_page_size = KeysetPagination.max_page_size
+
+
+class OptionalKeysetPagination(BasePagination):
+    """Page-number pagination unless the client opts into keyset paging.
+
+    Sending ``?cursor=`` (empty for the first page) switches the endpoint
+    to :class:`KeysetPagination`; existing ``?page=`` clients are unaffected.
+    """
+    keyset_class = KeysetPagination
+    page_number_class = SizedPageNumberPagination
+
+    def __init__(self):
+        self.paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.paginator = self.keyset_class()
+        else:
+            self.paginator = self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
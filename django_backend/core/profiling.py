@@ -0,0 +1,150 @@
+"""
+On-demand profiling of single requests for staff users.
+
+A staff or admin user adds ``?profile=1`` (or an ``X-Profile: 1`` header) to
+any request. The request then runs under ``cProfile`` while a sampling thread
+records its call stacks. The results are written to ``PROFILE_DIR`` as a
+``.pstats`` file and a ``.collapsed`` file that flamegraph.pl and speedscope
+read directly. A ``RequestProfile`` row points to both files.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from django.conf import settings
+from django.utils import timezone
+from . import instrumentation
+
+
+PROFILE_PARAM = 'profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+# One profile at a time per process: profilers distort each other's timings
+profiler_lock = threading.Lock()
+
+
+def profile_dir():
+    return str(getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def requested(request):
+    """Whether the client asked for this request to be profiled."""
+    flag = request.GET.get(PROFILE_PARAM) or request.META.get(PROFILE_HEADER)
+    return flag in ('1', 'true', 'yes')
+
+
+def is_staff(user):
+    return bool(user and user.is_authenticated and (user.is_staff or getattr(user, 'role', None) == 'admin'))
+
+
+def profiling_user(request):
+    """The staff user making ``request``, from the session or a bearer token, or None."""
+    user = getattr(request, 'user', None)
+    if is_staff(user):
+        return user
+    # API clients authenticate inside the DRF view, after middleware has run
+    from rest_framework.exceptions import APIException
+    from users.authentication import CachedJWTAuthentication
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except APIException:
+        return None
+    if result is not None and is_staff(result[0]):
+        return result[0]
+    return None
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every ``interval`` seconds into collapsed-stack counts."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(frames))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+@contextmanager
+def profiled():
+    """Profile the current thread for the duration of the block; yields the result holder."""
+    result = {}
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), getattr(settings, 'PROFILE_SAMPLE_INTERVAL', 0.001))
+    started = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        sampler.stop()
+        result.update(profiler=profiler, stacks=sampler.stacks, duration=time.perf_counter() - started)
+
+
+def save_profile(request, response, user, result):
+    """Write the profiler output to ``PROFILE_DIR`` and record it as a ``RequestProfile``."""
+    from .models import RequestProfile
+
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    stem = f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+    pstats_name, collapsed_name = f'{stem}.pstats', f'{stem}.collapsed'
+
+    result['profiler'].dump_stats(os.path.join(directory, pstats_name))
+    with open(os.path.join(directory, collapsed_name), 'w') as handle:
+        for stack, count in result['stacks'].most_common():
+            handle.write(f'{stack} {count}\n')
+
+    metrics = instrumentation.current()
+    profile = RequestProfile.objects.create(
+        user=user,
+        method=request.method,
+        path=request.path[:255],
+        view_name=(instrumentation.view_name(request) or '')[:200],
+        status_code=response.status_code,
+        duration_ms=round(result['duration'] * 1000, 2),
+        query_count=metrics.queries if metrics is not None else None,
+        pstats_file=pstats_name,
+        collapsed_file=collapsed_name,
+    )
+    prune(getattr(settings, 'PROFILE_KEEP', 200))
+    return profile
+
+
+def prune(keep):
+    """Delete all but the newest ``keep`` profiles (their files go with them)."""
+    from .models import RequestProfile
+
+    stale = RequestProfile.objects.values_list('pk', flat=True)[keep:]
+    for profile in RequestProfile.objects.filter(pk__in=list(stale)):
+        profile.delete()
+
+
+def remove_profile_files(sender, instance, **kwargs):
+    """``post_delete`` receiver removing a deleted profile's files."""
+    for name in (instance.pstats_file, instance.collapsed_file):
+        try:
+            os.remove(os.path.join(profile_dir(), name))
+        except FileNotFoundError:
+            pass
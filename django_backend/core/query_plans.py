@@ -0,0 +1,131 @@
+"""
+EXPLAIN checks for the hot API views.
+
+:func:`check_query_plans` runs each view in :func:`hot_views` against
+throwaway data, explains every SELECT it issues and reports any full table
+scan. ``core.tests`` runs it on every ``manage.py test``; the
+``check_query_plans`` command runs it against a real database.
+"""
+import re
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from core.management.utils import request_host
+
+
+# SQLite reports "SCAN <table>" with no index for a full table scan
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)( .*)?$')
+POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def hot_views():
+    """``(label, view, query string, kwargs, tables allowed to be scanned)`` for each hot path."""
+    from skills import views as skill_views
+    from swaps import views as swap_views
+    from users import views as user_views
+
+    return [
+        ('user list', user_views.UserListView.as_view(), '', {}, ()),
+        ('user list, available', user_views.UserListView.as_view(), 'available=true', {}, ()),
+        ('user list, cursor', user_views.UserListView.as_view(), 'cursor=', {}, ()),
+        ('user detail', user_views.UserDetailView.as_view(), '', {'pk': 'other'}, ()),
+        ('skill list', skill_views.SkillListView.as_view(), 'cursor=', {}, ()),
+        ('available skills', skill_views.available_skills, '', {}, ()),
+        ('popular skills', skill_views.popular_skills, '', {}, ()),
+        # Groups every skill by design
+        ('skill categories', skill_views.skill_categories, '', {}, ('skills_skill',)),
+        ('skill matches', skill_views.SkillMatchListView.as_view(), '', {}, ()),
+        ('swap list', swap_views.SwapRequestListView.as_view(), '', {}, ()),
+        ('swap list, pending inbox', swap_views.SwapRequestListView.as_view(), 'direction=received&status=pending', {}, ()),
+        ('swap list, sent by status', swap_views.SwapRequestListView.as_view(), 'direction=sent&status=accepted', {}, ()),
+        ('my swap requests', swap_views.my_swap_requests, '', {}, ()),
+        ('ratings given', swap_views.SwapRatingListView.as_view(), '', {}, ()),
+        ('ratings received', swap_views.SwapRatingListView.as_view(), 'direction=received', {}, ()),
+    ]
+
+
+def check_query_plans(show_plans=False, write=None):
+    """Return one failure message per view that errored or caused a full scan.
+
+    Plans with a full scan, or every plan with ``show_plans``, are passed to
+    ``write``. Fixtures are created in a transaction that is rolled back.
+    """
+    failures = []
+    # Cached responses would skip the queries under test
+    with override_settings(RESPONSE_CACHE_TTLS={}), transaction.atomic():
+        user, other = create_fixtures()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Tiny tables make a sequential scan look cheapest; ask for the index plan
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+        factory = APIRequestFactory(SERVER_NAME=request_host())
+        for label, view, query, kwargs, allowed in hot_views():
+            kwargs = {key: other.pk if value == 'other' else value for key, value in kwargs.items()}
+            request = factory.get(f'/?{query}')
+            force_authenticate(request, user)
+            with CaptureQueriesContext(connection) as captured:
+                response = view(request, **kwargs)
+            if response.status_code != 200:
+                failures.append(f'{label}: HTTP {response.status_code}')
+                continue
+
+            for query_info in captured.captured_queries:
+                sql = query_info['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                plan = explain(sql)
+                scanned = [table for table in full_scans(plan) if table not in allowed]
+                if write and (scanned or show_plans):
+                    write(f'-- {label}\n{sql}\n' + '\n'.join(f'   {line}' for line in plan) + '\n')
+                if scanned:
+                    failures.append(f"{label}: full scan of {', '.join(scanned)}")
+
+        transaction.set_rollback(True)
+    return failures
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    # Subqueries and CTEs show up as scans too; only real tables count
+    tables = set(connection.introspection.table_names())
+    scanned = []
+    for line in plan:
+        if connection.vendor == 'sqlite':
+            match = SQLITE_SCAN.match(line.strip())
+            if match and not (match.group(2) or '').startswith((' USING', ' VIRTUAL TABLE')):
+                scanned.append(match.group(1))
+        else:
+            match = POSTGRES_FULL_SCAN.search(line)
+            if match:
+                scanned.append(match.group(1))
+    return [table for table in scanned if table in tables]
+
+
+def create_fixtures():
+    from skills.models import Skill, SkillRequest
+    from swaps.models import SwapRating, SwapRequest
+    from users.models import User
+
+    user = User.objects.create_user(
+        email='plan-check-a@example.com', username='plan-check-a', password=None,
+        skills_offered=['Python'], skills_wanted=['Guitar'],
+    )
+    other = User.objects.create_user(
+        email='plan-check-b@example.com', username='plan-check-b', password=None,
+        skills_offered=['Guitar'], skills_wanted=['Python'],
+    )
+    skill = Skill.objects.get(name='Python')
+    SkillRequest.objects.create(skill=skill, requester=user)
+    sent = SwapRequest.objects.create(requester=user, recipient=other, requested_skill='Guitar', status='accepted')
+    SwapRequest.objects.create(requester=other, recipient=user, requested_skill='Python')
+    SwapRating.objects.create(swap_request=sent, rater=other, rated_user=user, rating=5)
+    return user, other
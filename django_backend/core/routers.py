@@ -0,0 +1,54 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+
+# Alias the current request/task reads from: the replica picked for it, or the primary
+_read_alias = ContextVar('read_alias', default='default')
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != 'default']
+
+
+@contextmanager
+def replica_reads(allowed=True):
+    """Allow (or forbid) replica reads for the enclosed block.
+
+    One replica is picked for the whole block, so a request's reads see a
+    single, consistent copy and routing a query costs no random draw.
+    """
+    replicas = replica_aliases() if allowed else []
+    token = _read_alias.set(random.choice(replicas) if replicas else 'default')
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def pin_to_primary():
+    """Send every further read in this context to the primary."""
+    _read_alias.set('default')
+
+
+class ReplicaRouter:
+    """Route reads to a randomly picked replica and everything else to ``default``.
+
+    Reads only leave the primary inside :func:`replica_reads` blocks, which
+    ``ReplicaReadsMiddleware`` opens for safe HTTP methods. Management
+    commands, signal handlers and write requests therefore always read what
+    they just wrote, and the first write in a GET request pins the rest of
+    it to the primary as well.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
@@ -0,0 +1,47 @@
+from rest_framework import serializers
+from .instrumentation import timer
+
+
+def _split_param(value):
+    return {part.strip() for part in (value or '').split(',') if part.strip()}
+
+
+class SparseFieldsetsMixin:
+    """Let API clients choose the fields they get back.
+
+    ``?fields=id,status`` keeps only the listed top-level fields and
+    ``?expand=requester`` swaps a compact nested representation for the
+    full one declared in ``Meta.expandable_fields``. Only the outermost
+    serializer of a response reacts to the query string.
+    """
+
+    def _is_root(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not self._is_root():
+            return fields
+        
+        expand = _split_param(request.query_params.get('expand'))
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in expand.intersection(expandable):
+            if name in fields:
+                fields[name] = expandable[name](read_only=True)
+        
+        wanted = _split_param(request.query_params.get('fields'))
+        if wanted:
+            for name in set(fields) - wanted:
+                fields.pop(name)
+        return fields
+
+    def to_representation(self, instance):
+        if not self._is_root():
+            return super().to_representation(instance)
+        # Nested serializers run inside their root's timer
+        with timer('serialize'):
+            return super().to_representation(instance)
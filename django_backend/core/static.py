@@ -0,0 +1,199 @@
+"""
+Static and media file serving with compression, caching, ranges and sendfile.
+
+``serve_static`` answers for ``STATIC_URL`` and ``serve_media`` for
+``MEDIA_URL``. They pick the precompressed ``.br`` / ``.gz`` copy written by
+``core.storage`` when the client accepts it. Content-hashed names are cached
+for a year as ``immutable``; everything else is revalidated with
+``Last-Modified``. Single byte ranges are answered with 206.
+
+With ``SENDFILE_BACKEND`` set, the body is left to the front-end server:
+``'x-sendfile'`` (Apache mod_xsendfile, lighttpd) sends the absolute path,
+and ``'x-accel-redirect'`` (nginx) sends the path below
+``SENDFILE_URL_PREFIX``. Otherwise ``FileResponse`` lets the WSGI server's
+``wsgi.file_wrapper`` use ``sendfile(2)`` when it has one.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Most preferred first; must match the suffixes core.storage writes
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+@lru_cache(maxsize=1)
+def hashed_static_names():
+    """Every content-hashed name in the staticfiles manifest."""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    return frozenset(hashed_files.values()) if hashed_files else frozenset()
+
+
+def serve_static(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    if settings.DEBUG:
+        # Straight from the app/STATICFILES_DIRS sources, no collectstatic needed
+        fullpath = finders.find(path)
+        if not fullpath:
+            raise Http404('"%s" could not be found' % path)
+        return serve_file(request, fullpath, path, immutable=False)
+    immutable = path in hashed_static_names()
+    return serve_file(request, _resolve(settings.STATIC_ROOT, path), path, immutable=immutable)
+
+
+def serve_media(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    return serve_file(request, _resolve(settings.MEDIA_ROOT, path), path, immutable=False,
+                      max_age=getattr(settings, 'MEDIA_MAX_AGE', 3600))
+
+
+def _resolve(root, path):
+    if not root:
+        raise Http404
+    try:
+        fullpath = safe_join(root, path)
+    except Exception:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404('"%s" does not exist' % path)
+    return fullpath
+
+
+def serve_file(request, fullpath, path, immutable=False, max_age=None):
+    """Respond with ``fullpath``, honouring Accept-Encoding, conditional headers and Range."""
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+        _cache_headers(response, immutable, max_age)
+        return response
+
+    content_type, encoding = mimetypes.guess_type(path)
+    content_type = content_type or 'application/octet-stream'
+    byte_range = request.META.get('HTTP_RANGE')
+
+    # Ranges refer to the identity encoding, so never combine them with compression
+    chosen_path, content_encoding = fullpath, encoding
+    if encoding is None and not byte_range:
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        for name, suffix in ENCODINGS:
+            if name in accepted and os.path.isfile(fullpath + suffix):
+                chosen_path, content_encoding = fullpath + suffix, name
+                break
+
+    size = os.path.getsize(chosen_path)
+    start, end = 0, size - 1
+    status = 200
+    # With a sendfile backend the front-end server answers the Range itself
+    if byte_range and not getattr(settings, 'SENDFILE_BACKEND', None):
+        parsed = parse_range(byte_range, size)
+        if parsed is None:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        if parsed is not False:
+            start, end = parsed
+            status = 206
+
+    response = _file_response(chosen_path, start, end, size, content_type, status)
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    if content_encoding:
+        response['Content-Encoding'] = content_encoding
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    _cache_headers(response, immutable, max_age)
+    return response
+
+
+def parse_range(header, size):
+    """``(start, end)`` for a single satisfiable byte range, False to ignore it, None if unsatisfiable."""
+    match = _RANGE.match(header.strip())
+    if match is None:
+        # Multiple or malformed ranges: RFC 9110 lets us send the whole file
+        return False
+    first, last = match.groups()
+    if not first and not last:
+        return False
+    if not first:
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def _file_response(path, start, end, size, content_type, status):
+    backend = getattr(settings, 'SENDFILE_BACKEND', None)
+    if backend:
+        # The front-end server reads the file and turns a Range request into its own 206
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = _accel_path(path)
+        else:
+            response['X-Sendfile'] = path
+        return response
+
+    handle = open(path, 'rb')
+    if status == 200:
+        return FileResponse(handle, content_type=content_type)
+    handle.seek(start)
+    response = FileResponse(_RangeReader(handle, end - start + 1), content_type=content_type, status=status)
+    response['Content-Length'] = end - start + 1
+    return response
+
+
+def _accel_path(path):
+    prefix = getattr(settings, 'SENDFILE_URL_PREFIX', '/protected/')
+    for root in (settings.STATIC_ROOT, settings.MEDIA_ROOT):
+        if root and path.startswith(os.path.join(str(root), '')):
+            kind = 'static' if root == settings.STATIC_ROOT else 'media'
+            return posixpath.join(prefix, kind, os.path.relpath(path, root).replace(os.sep, '/'))
+    raise Http404
+
+
+def _cache_headers(response, immutable, max_age):
+    if immutable:
+        response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        age = max_age if max_age is not None else getattr(settings, 'STATIC_MAX_AGE', 60)
+        response['Cache-Control'] = f'public, max-age={age}'
+
+
+class _RangeReader:
+    """File-like view of ``length`` bytes from ``handle``'s current position."""
+
+    def __init__(self, handle, length):
+        self.handle = handle
+        self.remaining = length
+        self.name = handle.name
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.handle.close()
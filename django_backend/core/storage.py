@@ -0,0 +1,59 @@
+import gzip
+import os
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.html', '.txt', '.xml',
+    '.ico', '.wasm', '.ttf', '.otf', '.eot',
+}
+
+# suffix -> compress(bytes)
+ENCODERS = {'.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+if brotli is not None:
+    ENCODERS['.br'] = lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Content-hashed static files, each also saved as ``.gz`` (and ``.br``) next to it.
+
+    Compression runs once as a ``collectstatic`` post-processing step, so
+    ``core.static.serve`` only has to pick the smallest encoding the client
+    accepts.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        # Files are revisited on each CSS/JS reference pass; compress each once
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names[hashed_name] = None
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in hashed_names:
+            for compressed_name in self.compress(hashed_name):
+                yield hashed_name, compressed_name, True
+
+    def compress(self, name):
+        """Write compressed copies of ``name`` that are smaller than the original."""
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as handle:
+            data = handle.read()
+        if len(data) < getattr(settings, 'STATIC_COMPRESS_MIN_SIZE', 256):
+            return
+        for suffix, encode in ENCODERS.items():
+            compressed = encode(data)
+            if len(compressed) >= len(data):
+                continue
+            path = self.path(name + suffix)
+            with open(path, 'wb') as handle:
+                handle.write(compressed)
+            yield name + suffix
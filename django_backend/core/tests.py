@@ -0,0 +1,98 @@
+import os
+import tempfile
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from skills.models import Skill
+from swaps.models import SwapRequest
+from users.models import User
+from .query_plans import check_query_plans, explain, full_scans
+from .static import serve_media
+
+
+class QueryPlanTests(TestCase):
+    """EXPLAIN regression check for the hot API views."""
+
+    def test_hot_views_use_indexes(self):
+        plans = []
+        failures = check_query_plans(write=plans.append)
+        self.assertEqual(failures, [], '\n'.join(plans))
+
+    def test_full_scan_is_detected(self):
+        plan = explain("SELECT * FROM skills_skill WHERE description = 'x'")
+        self.assertEqual(full_scans(plan), ['skills_skill'])
+
+
+class PageSizeTests(APITestCase):
+    """``?page_size=`` applies to page-number pages as well as keyset ones."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='a', email='a@example.com', password='pass')
+        other = User.objects.create_user(username='b', email='b@example.com', password='pass')
+        for skill in ('Go', 'Rust', 'Python'):
+            SwapRequest.objects.create(requester=self.user, recipient=other, requested_skill=skill)
+        self.client.force_authenticate(self.user)
+
+    def test_page_mode(self):
+        response = self.client.get(reverse('swap-list'), {'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_keyset_mode(self):
+        response = self.client.get(reverse('swap-list'), {'cursor': '', 'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next_cursor'])
+
+    def test_async_page_mode(self):
+        for name in ('Go', 'Rust'):
+            Skill.objects.create(name=name)
+        token = AccessToken.for_user(self.user)
+        response = async_to_sync(self.async_client.get)(
+            reverse('async-skill-list'), {'page_size': 1}, headers={'authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(len(response.json()['results']), 1)
+
+
+class KeysetSearchTests(APITestCase):
+    """Keyset pages can't keep search relevance order, so the combination is refused."""
+
+    def setUp(self):
+        Skill.objects.create(name='Guitar')
+        self.client.force_authenticate(User.objects.create_user(username='a', email='a@example.com', password='pass'))
+
+    def test_cursor_with_search_is_rejected(self):
+        response = self.client.get(reverse('skill-list'), {'cursor': '', 'search': 'guit'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.data)
+
+    def test_page_with_search_keeps_working(self):
+        response = self.client.get(reverse('skill-list'), {'search': 'guit'})
+        self.assertEqual([skill['name'] for skill in response.data['results']], ['Guitar'])
+
+
+class RangeTests(TestCase):
+    """Range handling with and without a sendfile backend."""
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        with open(os.path.join(self.root.name, 'clip.bin'), 'wb') as handle:
+            handle.write(b'0123456789')
+        self.request = RequestFactory().get('/media/clip.bin', HTTP_RANGE='bytes=2-5')
+
+    def test_range_is_served_as_206(self):
+        with override_settings(MEDIA_ROOT=self.root.name, SENDFILE_BACKEND=None):
+            response = serve_media(self.request, 'clip.bin')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+            self.assertEqual(b''.join(response.streaming_content), b'2345')
+            response.close()
+
+    def test_sendfile_leaves_range_to_the_web_server(self):
+        with override_settings(MEDIA_ROOT=self.root.name, SENDFILE_BACKEND='x-sendfile'):
+            response = serve_media(self.request, 'clip.bin')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Range', response)
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.root.name, 'clip.bin'))
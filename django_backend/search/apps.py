@@ -0,0 +1,13 @@
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_migrate
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from . import signals
+        # post_migrate is only sent for apps with models, which search has none
+        # of; it fires after all migrations, so listening for skills is enough
+        post_migrate.connect(signals.setup_search_index, sender=apps.get_app_config('skills'))
@@ -0,0 +1,304 @@
+import re
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+USER_TEXT_FIELDS = (
+    'username', 'first_name', 'last_name', 'email', 'bio', 'location',
+    'skills_offered', 'skills_wanted',
+)
+SKILL_TEXT_FIELDS = ('name', 'category', 'description')
+
+
+def tokenize(query):
+    """Split a search string into lowercase terms."""
+    return [token.lower() for token in TOKEN_RE.findall(query or '')]
+
+
+def user_document(user):
+    """Return the searchable columns for a user."""
+    skills = list(user.skills_offered or []) + list(user.skills_wanted or [])
+    return {
+        'name': ' '.join(filter(None, [user.first_name, user.last_name, user.username])),
+        'email': user.email or '',
+        'skills': ' '.join(str(skill) for skill in skills),
+        'location': user.location or '',
+        'bio': user.bio or '',
+    }
+
+
+def skill_document(skill):
+    """Return the searchable columns for a skill."""
+    return {
+        'name': skill.name,
+        'category': skill.get_category_display(),
+        'description': skill.description or '',
+    }
+
+
+def rank_by_ids(queryset, ids):
+    """Restrict ``queryset`` to ``ids`` and keep the order they were ranked in."""
+    if not ids:
+        return queryset.none()
+    rank = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank).order_by('search_rank')
+
+
+class BaseSearchBackend:
+    """Interface shared by the search backends."""
+
+    def __init__(self, using='default'):
+        self.using = using
+        self.max_results = getattr(settings, 'SEARCH_MAX_RESULTS', 200)
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def setup(self):
+        """Create whatever tables or indexes the backend needs."""
+
+    def index_user(self, user):
+        pass
+
+    def remove_user(self, pk):
+        pass
+
+    def index_skill(self, skill):
+        pass
+
+    def remove_skill(self, pk):
+        pass
+
+    def rebuild(self):
+        """Rebuild the index from scratch and return ``(users, skills)`` indexed."""
+        return 0, 0
+
+    def search_users(self, queryset, query):
+        """Return ``(queryset, truncated)``: the matches ranked, and whether
+        some were dropped at ``SEARCH_MAX_RESULTS``."""
+        raise NotImplementedError
+
+    def search_skills(self, queryset, query):
+        """Like :meth:`search_users`, for skills."""
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Unranked ``icontains`` fallback for databases without a text index."""
+
+    def search_users(self, queryset, query):
+        from skills.models import UserSkill
+
+        for term in tokenize(query):
+            queryset = queryset.filter(
+                Q(first_name__icontains=term) |
+                Q(last_name__icontains=term) |
+                Q(username__icontains=term) |
+                Q(email__icontains=term) |
+                Q(bio__icontains=term) |
+                Q(location__icontains=term) |
+                Q(id__in=UserSkill.objects.matching(term).values('user_id'))
+            )
+        return queryset.order_by('-created_at'), False
+
+    def search_skills(self, queryset, query):
+        for term in tokenize(query):
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset, False
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """Ranked prefix search over SQLite FTS5 virtual tables."""
+
+    USER_TABLE = 'search_user_fts'
+    SKILL_TABLE = 'search_skill_fts'
+    USER_COLUMNS = ('name', 'email', 'skills', 'location', 'bio')
+    SKILL_COLUMNS = ('name', 'category', 'description')
+    # bm25() weights, in column order
+    USER_WEIGHTS = (10.0, 4.0, 6.0, 2.0, 1.0)
+    SKILL_WEIGHTS = (10.0, 3.0, 1.0)
+
+    _ready = set()
+
+    @classmethod
+    def is_supported(cls, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+    def setup(self):
+        with self.connection.cursor() as cursor:
+            for table, columns in ((self.USER_TABLE, self.USER_COLUMNS), (self.SKILL_TABLE, self.SKILL_COLUMNS)):
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} "
+                    f"USING fts5({', '.join(columns)}, tokenize='unicode61 remove_diacritics 2')"
+                )
+        self._ready.add(self.using)
+
+    def _ensure(self):
+        # Replicas are copies of the primary and get its tables with the next sync
+        if self.using == DEFAULT_DB_ALIAS and self.using not in self._ready:
+            self.setup()
+
+    def _upsert(self, table, columns, pk, document):
+        self._ensure()
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [pk])
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, {', '.join(columns)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(columns))})",
+                [pk] + [document[column] for column in columns]
+            )
+
+    def _delete(self, table, pk):
+        self._ensure()
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [pk])
+
+    def _match(self, table, weights, query):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Every term must match, each as a prefix so partially typed words still hit
+        match = ' '.join(f'"{term}"*' for term in terms)
+        self._ensure()
+        sql = (
+            f"SELECT rowid FROM {table} WHERE {table} MATCH %s "
+            f"ORDER BY bm25({table}, {', '.join(str(weight) for weight in weights)}) LIMIT %s"
+        )
+        # One row past the cap tells the caller that matches were dropped
+        params = [match, self.max_results + 1]
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                return [row[0] for row in cursor.fetchall()]
+        except OperationalError:
+            if self.using == DEFAULT_DB_ALIAS:
+                raise
+        # A replica synced before the tables existed; rank on the primary instead
+        primary = type(self)(DEFAULT_DB_ALIAS)
+        return primary._match(table, weights, query)
+
+    def _ranked(self, queryset, ids):
+        return rank_by_ids(queryset, ids[:self.max_results]), len(ids) > self.max_results
+
+    def index_user(self, user):
+        self._upsert(self.USER_TABLE, self.USER_COLUMNS, user.pk, user_document(user))
+
+    def remove_user(self, pk):
+        self._delete(self.USER_TABLE, pk)
+
+    def index_skill(self, skill):
+        self._upsert(self.SKILL_TABLE, self.SKILL_COLUMNS, skill.pk, skill_document(skill))
+
+    def remove_skill(self, pk):
+        self._delete(self.SKILL_TABLE, pk)
+
+    def _fill(self, table, columns, rows):
+        count = 0
+        sql = (
+            f"INSERT INTO {table} (rowid, {', '.join(columns)}) "
+            f"VALUES (%s, {', '.join(['%s'] * len(columns))})"
+        )
+        with self.connection.cursor() as cursor:
+            batch = []
+            for pk, document in rows:
+                batch.append([pk] + [document[column] for column in columns])
+                if len(batch) >= 1000:
+                    cursor.executemany(sql, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                count += len(batch)
+        return count
+
+    def rebuild(self):
+        from skills.models import Skill
+        from users.models import User
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.USER_TABLE}')
+            cursor.execute(f'DROP TABLE IF EXISTS {self.SKILL_TABLE}')
+        self.setup()
+
+        users = User.objects.using(self.using).only(*USER_TEXT_FIELDS).order_by('pk')
+        skills = Skill.objects.using(self.using).only(*SKILL_TEXT_FIELDS).order_by('pk')
+        return (
+            self._fill(self.USER_TABLE, self.USER_COLUMNS,
+                       ((user.pk, user_document(user)) for user in users.iterator(chunk_size=1000))),
+            self._fill(self.SKILL_TABLE, self.SKILL_COLUMNS,
+                       ((skill.pk, skill_document(skill)) for skill in skills.iterator(chunk_size=1000))),
+        )
+
+    def search_users(self, queryset, query):
+        return self._ranked(queryset, self._match(self.USER_TABLE, self.USER_WEIGHTS, query))
+
+    def search_skills(self, queryset, query):
+        return self._ranked(queryset, self._match(self.SKILL_TABLE, self.SKILL_WEIGHTS, query))
+
+
+class PostgresTrigramSearchBackend(BaseSearchBackend):
+    """Ranked fuzzy search backed by ``pg_trgm`` GIN indexes on the model tables."""
+
+    USER_DOCUMENT = (
+        "(username || ' ' || first_name || ' ' || last_name || ' ' || email"
+        " || ' ' || location || ' ' || bio)"
+    )
+    SKILL_DOCUMENT = "(name || ' ' || description)"
+
+    def setup(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS search_user_trgm ON users_user '
+                f'USING gin ({self.USER_DOCUMENT} gin_trgm_ops)'
+            )
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS search_userskill_trgm ON skills_userskill '
+                'USING gin (name gin_trgm_ops)'
+            )
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS search_skill_trgm ON skills_skill '
+                f'USING gin ({self.SKILL_DOCUMENT} gin_trgm_ops)'
+            )
+
+    def rebuild(self):
+        from skills.models import Skill
+        from users.models import User
+
+        with self.connection.cursor() as cursor:
+            for index in ('search_user_trgm', 'search_userskill_trgm', 'search_skill_trgm'):
+                cursor.execute(f'DROP INDEX IF EXISTS {index}')
+        self.setup()
+        return User.objects.using(self.using).count(), Skill.objects.using(self.using).count()
+
+    def search_users(self, queryset, query):
+        query = ' '.join(tokenize(query))
+        if not query:
+            return queryset.none(), False
+        matches = RawSQL(
+            f'SELECT id FROM users_user WHERE %s <%% {self.USER_DOCUMENT} '
+            'UNION SELECT user_id FROM skills_userskill WHERE %s <%% name',
+            (query, query)
+        )
+        rank = RawSQL(f'word_similarity(%s, {self.USER_DOCUMENT})', (query,))
+        return queryset.filter(id__in=matches).annotate(search_rank=rank).order_by('-search_rank', '-created_at'), False
+
+    def search_skills(self, queryset, query):
+        query = ' '.join(tokenize(query))
+        if not query:
+            return queryset.none(), False
+        matches = RawSQL(f'SELECT id FROM skills_skill WHERE %s <%% {self.SKILL_DOCUMENT}', (query,))
+        rank = RawSQL(f'word_similarity(%s, {self.SKILL_DOCUMENT})', (query,))
+        return queryset.filter(id__in=matches).annotate(search_rank=rank).order_by('-search_rank', 'name'), False
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+from .backends import DatabaseSearchBackend, PostgresTrigramSearchBackend, SQLiteFTSSearchBackend
+
+
+_backends = {}
+
+
+def get_backend(using='default'):
+    """Return the search backend for a database alias.
+
+    ``settings.SEARCH_BACKEND`` forces a backend class; otherwise one is
+    picked from the database vendor.
+    """
+    if using not in _backends:
+        backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+        if backend_path:
+            backend_class = import_string(backend_path)
+        else:
+            connection = connections[using]
+            if connection.vendor == 'sqlite' and SQLiteFTSSearchBackend.is_supported(connection):
+                backend_class = SQLiteFTSSearchBackend
+            elif connection.vendor == 'postgresql':
+                backend_class = PostgresTrigramSearchBackend
+            else:
+                backend_class = DatabaseSearchBackend
+        _backends[using] = backend_class(using)
+    return _backends[using]
+
+
+def search_users(queryset, query):
+    """Filter a User queryset by ``query`` and order it by relevance.
+
+    Returns ``(queryset, truncated)``; ``truncated`` is True when the backend
+    stopped at ``SEARCH_MAX_RESULTS`` matches.
+    """
+    return get_backend(queryset.db).search_users(queryset, query)
+
+
+def search_skills(queryset, query):
+    """Filter a Skill queryset by ``query`` and order it by relevance; see :func:`search_users`."""
+    return get_backend(queryset.db).search_skills(queryset, query)
+
+
+def flag_truncated(envelope, truncated):
+    """Tell the client, in a paginated response body, that results were cut off."""
+    if truncated:
+        envelope['search_truncated'] = True
+    return envelope
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from search.engine import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the user and skill full-text search index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        backend = get_backend(options['database'])
+        with transaction.atomic(using=options['database']):
+            users, skills = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {users} users and {skills} skills with {type(backend).__name__}'
+        ))
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from skills.models import Skill
+from users.models import User
+from .backends import SKILL_TEXT_FIELDS, USER_TEXT_FIELDS
+from .engine import get_backend
+
+
+def setup_search_index(using='default', **kwargs):
+    """Create the search tables/indexes after ``migrate``."""
+    get_backend(using).setup()
+
+
+@receiver(post_save, sender=User)
+def index_user(sender, instance, update_fields=None, raw=False, using='default', **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(USER_TEXT_FIELDS).intersection(update_fields):
+        return
+    get_backend(using).index_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def remove_user(sender, instance, using='default', **kwargs):
+    get_backend(using).remove_user(instance.pk)
+
+
+@receiver(post_save, sender=Skill)
+def index_skill(sender, instance, update_fields=None, raw=False, using='default', **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(SKILL_TEXT_FIELDS).intersection(update_fields):
+        return
+    get_backend(using).index_skill(instance)
+
+
+@receiver(post_delete, sender=Skill)
+def remove_skill(sender, instance, using='default', **kwargs):
+    get_backend(using).remove_skill(instance.pk)
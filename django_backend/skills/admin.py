@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Skill, SkillRequest
+from .models import Skill, SkillPopularity, SkillRequest, UserSkill
 
 
 @admin.register(Skill)
@@ -15,4 +15,18 @@ class SkillRequestAdmin(admin.ModelAdmin):
     list_display = ('skill', 'requester', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('skill__name', 'requester__email')
-    ordering = ('-created_at',) 
\ No newline at end of file
+    ordering = ('-created_at',) 
+
+@admin.register(UserSkill)
+class UserSkillAdmin(admin.ModelAdmin):
+    list_display = ('user', 'skill', 'kind')
+    list_filter = ('kind',)
+    search_fields = ('name', 'user__email')
+    raw_id_fields = ('user', 'skill')
+
+
+@admin.register(SkillPopularity)
+class SkillPopularityAdmin(admin.ModelAdmin):
+    list_display = ('skill', 'offered_count', 'wanted_count')
+    ordering = ('-offered_count',)
+    search_fields = ('skill__name',)
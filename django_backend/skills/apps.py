@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class SkillsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'skills' 
\ No newline at end of file
+    name = 'skills'
+
+    def ready(self):
+        from . import signals  # noqa: F401
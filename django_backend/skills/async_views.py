@@ -0,0 +1,57 @@
+from asgiref.sync import sync_to_async
+from core.async_api import APIResponse, apaginate, async_api_view
+from core.cache import acached_render
+from core.conditional import aconditional_response, aqueryset_validators
+from search.engine import flag_truncated, search_skills
+from users.authentication import TokenUserAuthentication
+from users.models import User
+from .models import Skill
+from .serializers import SkillSerializer
+from .views import POPULAR_KIND_ERROR, abuild_skill_categories, filter_skills, popular_skills_queryset
+
+
+@async_api_view(TokenUserAuthentication)
+async def skill_list(request):
+    """Async version of ``SkillListView``."""
+    queryset = filter_skills(Skill.objects.all(), request.query_params)
+    search = request.query_params.get('search', None)
+    truncated = False
+    if search:
+        queryset, truncated = await sync_to_async(search_skills)(queryset, search)
+    
+    async def render():
+        rows, envelope = await apaginate(request, queryset)
+        envelope['results'] = SkillSerializer(rows, many=True, context={'request': request}).data
+        return APIResponse(flag_truncated(envelope, truncated))
+    
+    return await aconditional_response(
+        request,
+        lambda: aqueryset_validators(request, queryset),
+        lambda: acached_render(request, 'skill-list', 'shared', [Skill], render, APIResponse),
+    )
+
+
+@async_api_view(TokenUserAuthentication)
+async def popular_skills(request):
+    """Async version of ``popular_skills``."""
+    async def render():
+        rows = popular_skills_queryset(request.query_params)
+        if rows is None:
+            return APIResponse({'error': POPULAR_KIND_ERROR}, status=400)
+        return APIResponse({
+            'popular_skills': [{'skill': skill, 'count': count} async for skill, count in rows]
+        })
+    
+    return await acached_render(request, 'popular-skills', 'shared', [User, Skill], render, APIResponse)
+
+
+@async_api_view(TokenUserAuthentication)
+async def skill_categories(request):
+    """Async version of ``skill_categories``."""
+    async def render():
+        return APIResponse({'categories': await abuild_skill_categories()})
+    
+    return await aconditional_response(
+        request, lambda: aqueryset_validators(request, Skill.objects.all()),
+        lambda: acached_render(request, 'skill-categories', 'shared', [Skill], render, APIResponse),
+    )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from users.models import User
+from skills.matching import refresh_matches_for_user
+
+
+class Command(BaseCommand):
+    help = 'Recompute the SkillMatch candidate index for every user.'
+
+    def handle(self, *args, **options):
+        users = 0
+        user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+        for user_id in user_ids.iterator(chunk_size=1000):
+            refresh_matches_for_user(user_id)
+            users += 1
+        self.stdout.write(self.style.SUCCESS(f'Refreshed matches for {users} users'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from skills.models import SkillPopularity, UserSkill
+
+
+class Command(BaseCommand):
+    help = 'Recount SkillPopularity from the UserSkill table in bulk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Repair any drift between the mirrored availability flag and the user row
+            UserSkill.objects.filter(user__is_available=True, is_available=False).update(is_available=True)
+            UserSkill.objects.filter(user__is_available=False, is_available=True).update(is_available=False)
+            
+            counters = {}
+            grouped = (
+                UserSkill.objects.filter(is_available=True)
+                .values_list('skill_id', 'kind')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            for skill_id, kind, total in grouped:
+                row = counters.setdefault(skill_id, SkillPopularity(skill_id=skill_id))
+                setattr(row, SkillPopularity.count_field(kind), total)
+            
+            SkillPopularity.objects.all().delete()
+            SkillPopularity.objects.bulk_create(counters.values(), batch_size=options['batch_size'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt popularity for {len(counters)} skills'))
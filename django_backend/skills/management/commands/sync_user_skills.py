@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from users.models import User
+from skills.models import UserSkill
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the UserSkill table from User.skills_offered / User.skills_wanted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        users = User.objects.only('id', 'skills_offered', 'skills_wanted', 'is_available').order_by('id')
+        changed = 0
+        for user in users.iterator(chunk_size=options['batch_size']):
+            if UserSkill.sync_for_user(user):
+                changed += 1
+        self.stdout.write(self.style.SUCCESS(f'Synced skills for {changed} users'))
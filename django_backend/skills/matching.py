@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, Value, When
+from .models import SkillMatch, UserSkill
+
+
+def _partners(kind, names, user_id):
+    """Count, per other user, how many of ``names`` they list under ``kind``."""
+    if not names:
+        return {}
+    rows = (
+        UserSkill.objects.filter(kind=kind, name__in=names)
+        .exclude(user_id=user_id)
+        .values_list('user_id')
+        .annotate(total=Count('name', distinct=True))
+        .order_by()
+    )
+    return dict(rows)
+
+
+def compute_matches(user_id):
+    """Return ``{candidate_id: (teaches_count, learns_count)}`` for reciprocal partners."""
+    offered, wanted = [], []
+    for name, kind in UserSkill.objects.filter(user_id=user_id).values_list('name', 'kind'):
+        (offered if kind == UserSkill.KIND_OFFERED else wanted).append(name)
+    
+    # Look both directions up in the skill -> users index
+    teachers = _partners(UserSkill.KIND_OFFERED, wanted, user_id)
+    learners = _partners(UserSkill.KIND_WANTED, offered, user_id)
+    return {
+        candidate_id: (teaches, learners[candidate_id])
+        for candidate_id, teaches in teachers.items()
+        if candidate_id in learners
+    }
+
+
+def refresh_matches_for_user(user_id):
+    """Recompute one user's matches in both directions.
+    
+    Only rows that involve this user are touched, so the cost is bounded by
+    the number of users sharing a skill with them.
+    """
+    with transaction.atomic():
+        matches = compute_matches(user_id)
+        rows = []
+        for candidate_id, (teaches, learns) in matches.items():
+            overlap = teaches + learns
+            rows.append(SkillMatch(user_id=user_id, candidate_id=candidate_id,
+                                   teaches_count=teaches, learns_count=learns, overlap=overlap))
+            rows.append(SkillMatch(user_id=candidate_id, candidate_id=user_id,
+                                   teaches_count=learns, learns_count=teaches, overlap=overlap))
+        
+        SkillMatch.objects.filter(user_id=user_id).delete()
+        SkillMatch.objects.filter(candidate_id=user_id).delete()
+        # A candidate refreshing at the same time writes the same pair; upsert
+        # so whichever commits second overwrites rather than failing the save
+        SkillMatch.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True,
+            unique_fields=['user', 'candidate'],
+            update_fields=['teaches_count', 'learns_count', 'overlap'],
+        )
+    return len(matches)
+
+
+def ranked_matches(user, include_unavailable=False):
+    """Matches for ``user``, best first.
+    
+    The score is the overlap size, plus the candidate's rating scaled to
+    0-1, plus 1 if the candidate is currently available.
+    """
+    queryset = SkillMatch.objects.filter(user=user).select_related('candidate')
+    if not include_unavailable:
+        queryset = queryset.filter(candidate__is_available=True)
+    return queryset.annotate(
+        score=ExpressionWrapper(
+            F('overlap')
+            + F('candidate__rating') / Value(5.0)
+            + Case(When(candidate__is_available=True, then=Value(1.0)), default=Value(0.0)),
+            output_field=FloatField()
+        )
+    ).order_by('-score', 'candidate_id')
@@ -1,7 +1,34 @@
-from django.db import models
+from collections import Counter
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from users.models import User
 
 
+class SkillQuerySet(models.QuerySet):
+    """Custom queryset for Skill."""
+
+    def for_labels(self, labels):
+        """Return ``{normalized name: Skill}``, creating any skills that don't exist yet."""
+        labels = {UserSkill.normalize(label): label for label in labels}
+        found = {}
+        for skill in self.filter(name__in=set(labels.values())):
+            found.setdefault(UserSkill.normalize(skill.name), skill)
+        
+        missing = [label for name, label in labels.items() if name not in found]
+        if missing:
+            # Reuse skills that only differ by case before creating new ones
+            lowered = [UserSkill.normalize(label) for label in missing]
+            for skill in self.annotate(lowered_name=Lower('name')).filter(lowered_name__in=lowered):
+                found.setdefault(UserSkill.normalize(skill.name), skill)
+            missing = [label for name, label in labels.items() if name not in found]
+        # New labels are rare; create them one by one so post_save handlers run
+        for label in missing:
+            skill, _ = self.get_or_create(name=label)
+            found.setdefault(UserSkill.normalize(skill.name), skill)
+        return found
+
+
 class Skill(models.Model):
     """Skill model for categorizing and managing skills."""
     
@@ -24,11 +51,17 @@ class Skill(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = SkillQuerySet.as_manager()
+    
     def __str__(self):
         return self.name
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='skill_created_id'),
+            models.Index(fields=['updated_at'], name='skill_updated'),
+        ]
 
 
 class SkillRequest(models.Model):
@@ -40,4 +73,185 @@ class SkillRequest(models.Model):
     
     class Meta:
         unique_together = ['skill', 'requester']
-        ordering = ['-created_at'] 
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['requester', '-created_at'], name='skillreq_requester_created'),
+        ]
+
+
+class UserSkillQuerySet(models.QuerySet):
+    """Indexed lookups over the user/skill association."""
+
+    def matching(self, name):
+        """Match skills by prefix on the normalized name (an index range scan)."""
+        prefix = UserSkill.normalize(name)
+        if not prefix:
+            return self.none()
+        return self.filter(name__gte=prefix, name__lt=prefix + '\uffff')
+
+
+class UserSkill(models.Model):
+    """Normalized copy of ``User.skills_offered`` / ``User.skills_wanted``."""
+    
+    KIND_OFFERED = 'offered'
+    KIND_WANTED = 'wanted'
+    KIND_CHOICES = [
+        (KIND_OFFERED, 'Offered'),
+        (KIND_WANTED, 'Wanted'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='user_skills')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    name = models.CharField(max_length=100)
+    is_available = models.BooleanField(default=True)
+    
+    objects = UserSkillQuerySet.as_manager()
+    
+    class Meta:
+        unique_together = ['user', 'skill', 'kind']
+        indexes = [
+            models.Index(fields=['name', 'kind', 'user'], name='userskill_name_kind_user'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user} {self.kind} {self.skill}"
+    
+    @staticmethod
+    def normalize(name):
+        """Return the lookup key stored in ``name``."""
+        return str(name).strip().lower()[:100]
+    
+    @classmethod
+    def sync_for_user(cls, user):
+        """Bring the user's rows in line with their skills JSON fields.
+        
+        Popularity counters are adjusted by the difference, so the caller
+        never has to recount. Returns True if the user's set of skills
+        changed (availability flips alone return False).
+        """
+        wanted_rows = {}
+        for kind, skills in ((cls.KIND_OFFERED, user.skills_offered), (cls.KIND_WANTED, user.skills_wanted)):
+            for raw in skills or []:
+                label = str(raw).strip()[:100]
+                if label:
+                    wanted_rows.setdefault((cls.normalize(label), kind), label)
+        
+        with transaction.atomic():
+            # Serialise concurrent syncs of this user; both would otherwise insert
+            # the same missing rows and count them twice (SQLite locks on write anyway)
+            User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True).first()
+            existing = {
+                (row.name, row.kind): row
+                for row in cls.objects.filter(user=user)
+            }
+            
+            deltas = Counter()
+            stale = [row for key, row in existing.items() if key not in wanted_rows]
+            missing = {key: label for key, label in wanted_rows.items() if key not in existing}
+            flipped = [
+                row for key, row in existing.items()
+                if key in wanted_rows and row.is_available != user.is_available
+            ]
+            
+            for row in stale:
+                if row.is_available:
+                    deltas[(row.skill_id, row.kind)] -= 1
+            for row in flipped:
+                deltas[(row.skill_id, row.kind)] += 1 if user.is_available else -1
+            
+            if stale:
+                cls.objects.filter(pk__in=[row.pk for row in stale]).delete()
+            if flipped:
+                cls.objects.filter(pk__in=[row.pk for row in flipped]).update(
+                    is_available=user.is_available
+                )
+            if missing:
+                skills = Skill.objects.for_labels(missing.values())
+                created = cls.objects.bulk_create([
+                    cls(
+                        user=user, skill=skills[name], kind=kind, name=name,
+                        is_available=user.is_available,
+                    )
+                    for (name, kind) in missing
+                ])
+                if user.is_available:
+                    for row in created:
+                        deltas[(row.skill_id, row.kind)] += 1
+            
+            SkillPopularity.apply(deltas)
+        return bool(stale or missing)
+    
+    @classmethod
+    def release_for_user(cls, user):
+        """Take a deleted user's skills out of the popularity counters."""
+        deltas = Counter()
+        for skill_id, kind in cls.objects.filter(user=user, is_available=True).values_list('skill_id', 'kind'):
+            deltas[(skill_id, kind)] -= 1
+        SkillPopularity.apply(deltas)
+
+
+class SkillPopularity(models.Model):
+    """Per-skill offer/want counters over available users."""
+    
+    skill = models.OneToOneField(
+        Skill,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popularity'
+    )
+    offered_count = models.IntegerField(default=0)
+    wanted_count = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = 'Skill popularity'
+        indexes = [
+            models.Index(fields=['-offered_count'], name='skillpop_offered_count'),
+            models.Index(fields=['-wanted_count'], name='skillpop_wanted_count'),
+        ]
+    
+    def __str__(self):
+        return f"{self.skill}: {self.offered_count} offered, {self.wanted_count} wanted"
+    
+    @staticmethod
+    def count_field(kind):
+        return 'offered_count' if kind == UserSkill.KIND_OFFERED else 'wanted_count'
+    
+    @classmethod
+    def apply(cls, deltas):
+        """Apply ``{(skill_id, kind): delta}`` with atomic F() updates."""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        cls.objects.bulk_create(
+            [cls(skill_id=skill_id) for skill_id in {skill_id for skill_id, _ in deltas}],
+            ignore_conflicts=True,
+        )
+        for (skill_id, kind), delta in deltas.items():
+            field = cls.count_field(kind)
+            cls.objects.filter(skill_id=skill_id).update(**{field: F(field) + delta})
+
+
+class SkillMatch(models.Model):
+    """Precomputed reciprocal match between a user and a candidate partner.
+    
+    ``teaches_count`` is how many of the user's wanted skills the candidate
+    offers; ``learns_count`` is how many of the user's offered skills the
+    candidate wants. Only pairs where both are non-zero are stored, once
+    in each direction.
+    """
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_matches')
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    teaches_count = models.PositiveIntegerField()
+    learns_count = models.PositiveIntegerField()
+    overlap = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ['user', 'candidate']
+        indexes = [
+            models.Index(fields=['user', '-overlap'], name='skillmatch_user_overlap'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user} ↔ {self.candidate} ({self.overlap})"
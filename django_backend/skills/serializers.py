@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from .models import Skill, SkillRequest
-from users.serializers import UserSerializer
+from .models import Skill, SkillMatch, SkillRequest, UserSkill
+from core.serializers import SparseFieldsetsMixin
+from users.serializers import UserSerializer, UserSummarySerializer
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer for Skill model."""
     
     class Meta:
@@ -11,11 +12,38 @@ class SkillSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'category', 'description', 'created_at', 'updated_at']
 
 
-class SkillRequestSerializer(serializers.ModelSerializer):
+class SkillRequestSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer for SkillRequest model."""
-    requester = UserSerializer(read_only=True)
+    requester = UserSummarySerializer(read_only=True)
     skill = SkillSerializer(read_only=True)
     
     class Meta:
         model = SkillRequest
-        fields = ['id', 'skill', 'requester', 'created_at'] 
\ No newline at end of file
+        fields = ['id', 'skill', 'requester', 'created_at']
+        expandable_fields = {'requester': UserSerializer} 
+
+
+class SkillMatchSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """Serializer for a ranked reciprocal match."""
+    candidate = UserSummarySerializer(read_only=True)
+    score = serializers.FloatField(read_only=True)
+    teaches = serializers.SerializerMethodField()
+    learns = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = SkillMatch
+        fields = ['candidate', 'score', 'overlap', 'teaches_count', 'learns_count', 'teaches', 'learns']
+        expandable_fields = {'candidate': UserSerializer}
+    
+    @staticmethod
+    def _overlap(mine, theirs):
+        wanted = {UserSkill.normalize(skill) for skill in mine or []}
+        return [skill for skill in theirs or [] if UserSkill.normalize(skill) in wanted]
+    
+    def get_teaches(self, obj):
+        """Skills the candidate offers that the user wants."""
+        return self._overlap(obj.user.skills_wanted, obj.candidate.skills_offered)
+    
+    def get_learns(self, obj):
+        """Skills the candidate wants that the user offers."""
+        return self._overlap(obj.user.skills_offered, obj.candidate.skills_wanted)
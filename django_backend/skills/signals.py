@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from users.models import User
+from .matching import refresh_matches_for_user
+from .models import UserSkill
+
+
+SKILL_FIELDS = {'skills_offered', 'skills_wanted', 'is_available'}
+
+
+@receiver(post_save, sender=User)
+def sync_user_skills(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keep UserSkill rows, popularity counters and matches in sync with the user."""
+    if raw:
+        return
+    if update_fields is not None and not SKILL_FIELDS.intersection(update_fields):
+        return
+    if UserSkill.sync_for_user(instance):
+        refresh_matches_for_user(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def release_user_skills(sender, instance, **kwargs):
+    """Decrement popularity counters before the user's rows cascade away."""
+    UserSkill.release_for_user(instance)
+
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import mock
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from core.cache import model_generation
+from users.models import User
+from .matching import refresh_matches_for_user
+from .models import Skill, SkillMatch
+
+
+class SkillCategoriesValidatorTests(APITestCase):
+    """The categories ETag must follow the rows, not this process's cache generation."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pass')
+        self.skill = Skill.objects.create(name='Python', category='technology')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('skill-categories')
+
+    def change_skill_elsewhere(self):
+        # update() sends no post_save, like a write made by another worker
+        generation = model_generation(Skill)
+        Skill.objects.filter(pk=self.skill.pk).update(
+            category='design', updated_at=timezone.now() + timedelta(minutes=1)
+        )
+        self.assertEqual(model_generation(Skill), generation)
+
+    def test_etag_changes_without_generation_bump(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.change_skill_elsewhere()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class AsyncSkillCategoriesValidatorTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='reader', email='reader@example.com', password='pass')
+        self.skill = Skill.objects.create(name='Python', category='technology')
+        self.headers = {'authorization': f'Bearer {AccessToken.for_user(user)}'}
+        self.url = reverse('async-skill-categories')
+
+    async def test_etag_changes_without_generation_bump(self):
+        etag = (await self.async_client.get(self.url, headers=self.headers))['ETag']
+
+        await Skill.objects.filter(pk=self.skill.pk).aupdate(updated_at=timezone.now() + timedelta(minutes=1))
+        response = await self.async_client.get(self.url, headers={**self.headers, 'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class RefreshMatchesTests(TestCase):
+
+    def test_pair_written_concurrently_is_upserted(self):
+        a = User.objects.create_user(username='a', email='a@example.com', password='pass',
+                                     skills_offered=['Go'], skills_wanted=['Rust'])
+        b = User.objects.create_user(username='b', email='b@example.com', password='pass',
+                                     skills_offered=['Rust'], skills_wanted=['Go'])
+        SkillMatch.objects.all().delete()
+        # What b's refresh, committing between a's delete and insert, would leave behind
+        SkillMatch.objects.create(user=a, candidate=b, teaches_count=9, learns_count=9, overlap=18)
+        SkillMatch.objects.create(user=b, candidate=a, teaches_count=9, learns_count=9, overlap=18)
+
+        with mock.patch.object(QuerySet, 'delete', return_value=(0, {})):
+            self.assertEqual(refresh_matches_for_user(a.pk), 1)
+        self.assertEqual(
+            sorted(SkillMatch.objects.values_list('user_id', 'candidate_id', 'overlap')),
+            sorted([(a.pk, b.pk, 2), (b.pk, a.pk, 2)]),
+        )
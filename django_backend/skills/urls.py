@@ -10,5 +10,6 @@ urlpatterns = [
     path('available/', views.available_skills, name='available-skills'),
     path('popular/', views.popular_skills, name='popular-skills'),
     path('categories/', views.skill_categories, name='skill-categories'),
+    path('matches/', views.SkillMatchListView.as_view(), name='skill-matches'),
     path('request/', views.request_skill, name='request-skill'),
 ] 
\ No newline at end of file
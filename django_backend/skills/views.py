@@ -1,42 +1,82 @@
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
 from django.db.models import Count, Q
+from users.authentication import TokenUserAuthentication
 from users.models import User
-from .models import Skill, SkillRequest
-from .serializers import SkillSerializer, SkillRequestSerializer
+from search.engine import flag_truncated, search_skills
+from core.cache import CachedResponseMixin, cached_response
+from core.conditional import ConditionalGetMixin, condition, queryset_validators
+from core.pagination import OptionalKeysetPagination
+from .models import Skill, SkillPopularity, SkillRequest, UserSkill
+from .matching import ranked_matches
+from .serializers import SkillMatchSerializer, SkillSerializer, SkillRequestSerializer
 
 
-class SkillListView(generics.ListAPIView):
+class SkillListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """List all skills with optional filtering."""
     serializer_class = SkillSerializer
+    authentication_classes = [TokenUserAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
+    cache_name = 'skill-list'
+    cache_depends_on = [Skill]
+    search_truncated = False
     
     def get_queryset(self):
-        queryset = Skill.objects.all()
+        queryset = filter_skills(Skill.objects.all(), self.request.query_params)
         
-        # Filter by category
-        category = self.request.query_params.get('category', None)
-        if category:
-            queryset = queryset.filter(category=category)
-        
-        # Search by name
+        # Full-text search over name, category and description
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(name__icontains=search)
+            queryset, self.search_truncated = search_skills(queryset, search)
         
         return queryset
+    
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        flag_truncated(response.data, self.search_truncated)
+        return response
+
+
+def filter_skills(queryset, params):
+    # Filter by category
+    category = params.get('category', None)
+    if category:
+        queryset = queryset.filter(category=category)
+    return queryset
+
+
+class SkillMatchListView(generics.ListAPIView):
+    """List users who offer what I want and want what I offer, best first."""
+    serializer_class = SkillMatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        include_unavailable = self.request.query_params.get('include_unavailable', '').lower() == 'true'
+        return ranked_matches(self.request.user, include_unavailable=include_unavailable)
+    
+    def list(self, request, *args, **kwargs):
+        # Share the already-loaded user so the serializer doesn't refetch it per row
+        page = self.paginate_queryset(self.get_queryset())
+        for match in page:
+            match.user = request.user
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 class SkillDetailView(generics.RetrieveAPIView):
     """Get specific skill details."""
     serializer_class = SkillSerializer
+    authentication_classes = [TokenUserAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     queryset = Skill.objects.all()
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@authentication_classes([TokenUserAuthentication])
+@cached_response('available-skills', scope='user', depends_on=[User])
 def available_skills(request):
     """Get users with their available skills."""
     users = User.objects.exclude(id=request.user.id).filter(is_available=True)
@@ -45,8 +85,7 @@ def available_skills(request):
     skill = request.query_params.get('skill', None)
     if skill:
         users = users.filter(
-            Q(skills_offered__icontains=skill) |
-            Q(skills_wanted__icontains=skill)
+            id__in=UserSkill.objects.matching(skill).values('user_id')
         )
     
     # Filter by location
@@ -59,43 +98,87 @@ def available_skills(request):
     return Response({'users': serializer.data})
 
 
+POPULAR_KIND_ERROR = 'kind must be "offered" or "wanted"'
+
+
+def popular_skills_queryset(params):
+    """Return ``(name, count)`` rows for ``popular_skills``, or None for a bad ``kind``."""
+    kind = params.get('kind', UserSkill.KIND_OFFERED)
+    if kind not in dict(UserSkill.KIND_CHOICES):
+        return None
+    
+    try:
+        limit = min(max(int(params.get('limit', 10)), 1), 100)
+    except ValueError:
+        limit = 10
+    
+    # Read the precomputed counters, highest first
+    field = SkillPopularity.count_field(kind)
+    return (
+        SkillPopularity.objects.filter(**{f'{field}__gt': 0})
+        .order_by(f'-{field}')
+        .values_list('skill__name', field)[:limit]
+    )
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@authentication_classes([TokenUserAuthentication])
+@cached_response('popular-skills', depends_on=[User, Skill])
 def popular_skills(request):
     """Get popular skills based on user offerings."""
-    # Count skills offered by users
-    skill_counts = {}
-    users = User.objects.filter(is_available=True)
-    
-    for user in users:
-        for skill in user.skills_offered:
-            skill_counts[skill] = skill_counts.get(skill, 0) + 1
+    rows = popular_skills_queryset(request.query_params)
+    if rows is None:
+        return Response(
+            {'error': POPULAR_KIND_ERROR},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    # Convert to list and sort by count
     popular_skills = [
         {'skill': skill, 'count': count}
-        for skill, count in sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
+        for skill, count in rows
     ]
     
-    return Response({'popular_skills': popular_skills[:10]})
+    return Response({'popular_skills': popular_skills})
+
+
+def build_skill_categories():
+    """Group every skill name under its category with a single query."""
+    return group_skill_categories(Skill.objects.values_list('category', 'name'))
+
+
+async def abuild_skill_categories():
+    return group_skill_categories([row async for row in Skill.objects.values_list('category', 'name')])
+
+
+def group_skill_categories(rows):
+    names_by_category = {code: [] for code, _ in Skill.CATEGORY_CHOICES}
+    for category_code, name in rows:
+        names_by_category.setdefault(category_code, []).append(name)
+    
+    return [
+        {
+            'name': category_name,
+            'code': category_code,
+            'skills': names_by_category[category_code]
+        }
+        for category_code, category_name in Skill.CATEGORY_CHOICES
+    ]
+
+
+def skill_categories_validators(request):
+    # Built from the rows rather than the cache generation, which is per process under locmem
+    return queryset_validators(request, Skill.objects.all())
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@authentication_classes([TokenUserAuthentication])
+@condition(skill_categories_validators)
+@cached_response('skill-categories', depends_on=[Skill])
 def skill_categories(request):
     """Get skill categories with their skills."""
-    categories = Skill.CATEGORY_CHOICES
-    category_data = []
-    
-    for category_code, category_name in categories:
-        skills = Skill.objects.filter(category=category_code).values_list('name', flat=True)
-        category_data.append({
-            'name': category_name,
-            'code': category_code,
-            'skills': list(skills)
-        })
-    
-    return Response({'categories': category_data})
+    return Response({'categories': build_skill_categories()})
 
 
 @api_view(['POST'])
@@ -0,0 +1,20 @@
+"""
+Async (ASGI) versions of the hot read endpoints, mounted under ``api/async/``.
+
+They answer exactly like their synchronous counterparts; serve the project
+with an ASGI server (see README) so requests waiting on the database don't
+each hold a worker thread.
+"""
+from django.urls import path
+from skills import async_views as skill_views
+from swaps import async_views as swap_views
+from users import async_views as user_views
+
+urlpatterns = [
+    path('users/list/', user_views.user_list, name='async-user-list'),
+    path('users/<int:pk>/', user_views.user_detail, name='async-user-detail'),
+    path('skills/', skill_views.skill_list, name='async-skill-list'),
+    path('skills/popular/', skill_views.popular_skills, name='async-popular-skills'),
+    path('skills/categories/', skill_views.skill_categories, name='async-skill-categories'),
+    path('swaps/my-requests/', swap_views.my_swap_requests, name='async-my-swap-requests'),
+]
@@ -5,6 +5,7 @@ Django settings for skillswap project.
 from pathlib import Path
 import os
 from datetime import timedelta
+from .database import database_settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -27,18 +28,24 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'corsheaders',
+    'rest_framework_simplejwt.token_blacklist',
     'users',
     'skills',
     'swaps',
+    'search',
+    'core',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.ReplicaReadsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,13 +72,66 @@ TEMPLATES = [
 WSGI_APPLICATION = 'skillswap.wsgi.application'
 
 # Database
-DATABASES = {
+# DATABASE_URL selects the primary (sqlite:///db.sqlite3 by default) and
+# DATABASE_REPLICA_URLS is a comma-separated list of read replicas. Persistent
+# connections are kept for DATABASE_CONN_MAX_AGE seconds (0 closes them after
+# every request, "none" keeps them forever).
+_conn_max_age = os.environ.get('DATABASE_CONN_MAX_AGE', '0')
+DATABASES = database_settings(
+    os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'),
+    [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()],
+    BASE_DIR,
+    conn_max_age=None if _conn_max_age.lower() == 'none' else int(_conn_max_age),
+)
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Applied to every new SQLite connection (see core.db.configure_sqlite)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Cache
+# CACHE_BACKEND is one of: locmem (per process), file, redis. The redis backend
+# needs the ``redis`` package and works with any Redis-compatible server.
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'skillswap'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': 300,
     }
 }
 
+# Response cache: per-view TTLs in seconds (0 or missing disables caching),
+# and the models whose post_save/post_delete invalidate cached responses
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TTLS = {
+    'popular-skills': 300,
+    'skill-list': 60,
+    'skill-categories': 60 * 60 * 24,
+    'user-detail': 60,
+    'available-skills': 30,
+}
+# locmem keeps model generations per process, so a save only invalidates the
+# worker that made it; other workers serve their copy for at most this long
+RESPONSE_CACHE_LOCAL_MAX_TTL = 30
+# Seconds between each process adding its hit/miss counts to the cache_stats counters
+RESPONSE_CACHE_STATS_INTERVAL = 10
+RESPONSE_CACHE_MODELS = [
+    'users.User',
+    'skills.Skill',
+    'swaps.SwapRequest',
+    'swaps.SwapRating',
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -96,12 +156,40 @@ USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
+STATIC_ROOT = os.environ.get('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+# The React production build (npm run build) is collected under static/app/
+FRONTEND_BUILD_DIR = os.environ.get('FRONTEND_BUILD_DIR', os.path.join(BASE_DIR.parent, 'build'))
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+if os.path.isdir(FRONTEND_BUILD_DIR):
+    STATICFILES_DIRS.append(('app', FRONTEND_BUILD_DIR))
+
+# collectstatic hashes file names and writes .gz (and .br, with the brotli
+# package installed) copies; core.static serves them
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+}
+STATIC_COMPRESS_MIN_SIZE = 256
+# Cache lifetimes for files whose names aren't content-hashed
+STATIC_MAX_AGE = 60
+MEDIA_MAX_AGE = 3600
+# None, 'x-sendfile' or 'x-accel-redirect' to hand file bodies to the web server
+SENDFILE_BACKEND = os.environ.get('SENDFILE_BACKEND') or None
+SENDFILE_URL_PREFIX = '/protected/'
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads larger than this are streamed to a temporary file instead of memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = 512 * 1024
+PROFILE_PHOTO_MAX_SIZE = 10 * 1024 * 1024
+
+# Square avatar sizes generated from profile photos (users.thumbnails), each
+# as WebP plus a JPEG fallback, by THUMBNAIL_WORKERS threads (0 = inline)
+PROFILE_PHOTO_VARIANTS = {'small': 64, 'medium': 256}
+THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', 2))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -111,7 +199,7 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -146,8 +234,56 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.TokenRefreshSerializer',
 }
 
+# Seconds between incremental reloads of the in-memory token blacklist
+TOKEN_REVOCATION_REFRESH = int(os.environ.get('TOKEN_REVOCATION_REFRESH', 5))
+# Blacklist rows younger than this are re-read on every reload, in case a
+# lower id commits after a higher one
+TOKEN_REVOCATION_OVERLAP = int(os.environ.get('TOKEN_REVOCATION_OVERLAP', 60))
+
+# Seconds an authenticated user row is reused from the per-process cache
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 30))
+
+# Request instrumentation (core.middleware.RequestMetricsMiddleware)
+# Server-Timing headers reveal query counts, so they are opt-in outside DEBUG
+REQUEST_TIMING_HEADERS = os.environ.get('REQUEST_TIMING_HEADERS', str(DEBUG)).lower() in ('1', 'true', 'yes')
+# Warn when one SQL shape repeats more than this many times in a request
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+
+# On-demand profiling (core.middleware.ProfilingMiddleware): staff users add
+# ?profile=1 or an X-Profile: 1 header; output is written to PROFILE_DIR
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILE_KEEP = 200
+PROFILE_SAMPLE_INTERVAL = 0.001
+
+# /api/metrics: each worker writes to its own mmap'd file in METRICS_DIR.
+# Set METRICS_TOKEN to require "Authorization: Bearer <token>" when scraping
+METRICS_ENABLED = True
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, '.metrics'))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.requests': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Search settings
+# Backend is picked from the database vendor unless SEARCH_BACKEND names a class
+SEARCH_BACKEND = None
+SEARCH_MAX_RESULTS = 200
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -1,20 +1,28 @@
 """
 URL configuration for skillswap project.
 """
+import re
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from rest_framework_simplejwt.views import TokenRefreshView
+from core.static import serve_media, serve_static
+from core.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('users.urls')),
+    path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/auth/', include('users.urls')),
     path('api/users/', include('users.urls')),
     path('api/skills/', include('skills.urls')),
+    path('api/async/', include('skillswap.async_urls')),
     path('swaps/', include('swaps.urls')),
     path('api/health/', include('users.urls')),
+    path('api/metrics', metrics_view, name='metrics'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) 
\ No newline at end of file
+urlpatterns += [
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.STATIC_URL.lstrip('/')), serve_static),
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media),
+]
@@ -0,0 +1,34 @@
+from core.async_api import APIResponse, async_api_view
+from core.conditional import aconditional_response, aqueryset_validators
+from users.authentication import CachedJWTAuthentication
+from .models import SwapRequest
+from .serializers import SwapRequestSerializer
+from .views import OVERVIEW_RELATED_TIMESTAMPS, overview_pages, overview_pagination
+
+
+@async_api_view(CachedJWTAuthentication)
+async def my_swap_requests(request):
+    """Async version of ``my_swap_requests``."""
+    user = request.user
+    
+    async def render():
+        page_size, sent_page, received_page = overview_pages(request.query_params)
+        sent, received = await SwapRequest.objects.apages_by_direction(
+            user, sent_page=sent_page, received_page=received_page, page_size=page_size
+        )
+        counts = await SwapRequest.objects.astatus_counts(user)
+        context = {'request': request}
+        return APIResponse({
+            'sent_requests': SwapRequestSerializer(sent, many=True, context=context).data,
+            'received_requests': SwapRequestSerializer(received, many=True, context=context).data,
+            'counts': counts,
+            'pagination': overview_pagination(counts, page_size, sent_page, received_page),
+        })
+    
+    return await aconditional_response(
+        request,
+        lambda: aqueryset_validators(
+            request, SwapRequest.objects.involving(user), related=OVERVIEW_RELATED_TIMESTAMPS
+        ),
+        render,
+    )
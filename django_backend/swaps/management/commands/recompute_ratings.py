@@ -0,0 +1,37 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from users.models import User
+from swaps.models import SwapRating
+
+
+class Command(BaseCommand):
+    help = 'Rebuild every user rating aggregate from SwapRating in one grouped query.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        totals = (
+            SwapRating.objects.values_list('rated_user_id')
+            .annotate(total=Sum('rating'), count=Count('id'))
+            .order_by()
+        )
+        users = [
+            User(
+                pk=user_id,
+                rating_sum=total,
+                rating_count=count,
+                rating=round(Decimal(total) / count, 2),
+            )
+            for user_id, total, count in totals
+        ]
+        
+        with transaction.atomic():
+            User.objects.exclude(rating_count=0, rating_sum=0).update(rating=0, rating_sum=0, rating_count=0)
+            User.objects.bulk_update(
+                users, ['rating', 'rating_sum', 'rating_count'], batch_size=options['batch_size']
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f'Recomputed ratings for {len(users)} users'))
@@ -1,21 +1,194 @@
-from django.db import models
-from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Q, Value, When, Window
+from django.db.models.functions import Now, RowNumber
+from core import metrics
+from core.cache import invalidate_model
+from users.models import User
+
+
+class SwapRequestQuerySet(models.QuerySet):
+    """Custom queryset for SwapRequest."""
+    
+    def involving(self, user):
+        return self.filter(Q(requester=user) | Q(recipient=user))
+    
+    def transition(self, pk, to_status, user):
+        """Move request ``pk`` to ``to_status`` on behalf of ``user``.
+        
+        Runs a single ``UPDATE ... WHERE status=<expected>`` restricted to the
+        party allowed to make the move, and returns True only if this call
+        changed the row. When both parties act at once exactly one wins.
+        """
+        from_status, actor = SwapRequest.TRANSITIONS[to_status]
+        changed = self.filter(pk=pk, status=from_status, **{actor: user}).update(
+            status=to_status, updated_at=Now()
+        )
+        if changed:
+            # update() skips post_save, so invalidate cached responses by hand
+            transaction.on_commit(lambda: invalidate_model(SwapRequest))
+            transaction.on_commit(lambda: metrics.inc('skillswap_swap_transitions_total', status=to_status))
+        return bool(changed)
+    
+    def transition_many(self, ids, to_status, user):
+        """Apply one transition to many requests with a single conditional UPDATE.
+        
+        Returns ``{id: outcome}`` where outcome is ``'updated'``,
+        ``'not_found'`` (missing or not involving ``user``), ``'forbidden'``
+        (``user`` is the wrong party) or ``'invalid_status'``.
+        """
+        from_status, actor = SwapRequest.TRANSITIONS[to_status]
+        with transaction.atomic():
+            rows = (
+                self.involving(user).filter(pk__in=ids)
+                .select_for_update()
+                .values_list('pk', 'status', f'{actor}_id')
+            )
+            outcomes = dict.fromkeys(ids, 'not_found')
+            eligible = []
+            for pk, current, actor_id in rows:
+                if actor_id != user.pk:
+                    outcomes[pk] = 'forbidden'
+                elif current != from_status:
+                    outcomes[pk] = 'invalid_status'
+                else:
+                    eligible.append(pk)
+            
+            if eligible:
+                changed = self.filter(pk__in=eligible, status=from_status, **{actor: user}).update(
+                    status=to_status, updated_at=Now()
+                )
+                if changed != len(eligible):
+                    # Only possible where select_for_update() is a no-op; see what actually moved
+                    outcomes.update(dict.fromkeys(eligible, 'invalid_status'))
+                    eligible = list(self.filter(pk__in=eligible, status=to_status).values_list('pk', flat=True))
+                outcomes.update(dict.fromkeys(eligible, 'updated'))
+                if changed:
+                    transaction.on_commit(lambda: invalidate_model(SwapRequest))
+                    transaction.on_commit(lambda: metrics.inc('skillswap_swap_transitions_total', changed, status=to_status))
+        return outcomes
+    
+    def pages_by_direction(self, user, sent_page=1, received_page=1, page_size=20):
+        """Return ``(sent, received)`` pages for ``user`` from a single query.
+        
+        Rows are numbered per direction with a window function, so each side
+        is paginated independently without a second round trip.
+        """
+        return self._split_directions(self._direction_pages(user, sent_page, received_page, page_size))
+    
+    async def apages_by_direction(self, user, sent_page=1, received_page=1, page_size=20):
+        rows = self._direction_pages(user, sent_page, received_page, page_size)
+        return self._split_directions([row async for row in rows])
+    
+    def _direction_pages(self, user, sent_page, received_page, page_size):
+        direction = Case(
+            When(requester=user, then=Value('sent')),
+            default=Value('received'),
+            output_field=models.CharField()
+        )
+        sent_start = (sent_page - 1) * page_size
+        received_start = (received_page - 1) * page_size
+        return (
+            self.involving(user)
+            .select_related('requester', 'recipient')
+            .annotate(direction=direction)
+            .annotate(position=Window(
+                RowNumber(),
+                partition_by=[F('direction')],
+                order_by=[F('created_at').desc(), F('id').desc()]
+            ))
+            .filter(
+                Q(direction='sent', position__gt=sent_start, position__lte=sent_start + page_size) |
+                Q(direction='received', position__gt=received_start, position__lte=received_start + page_size)
+            )
+            .order_by('direction', 'position')
+        )
+    
+    @staticmethod
+    def _split_directions(rows):
+        sent, received = [], []
+        for row in rows:
+            (sent if row.direction == 'sent' else received).append(row)
+        return sent, received
+    
+    def status_counts(self, user):
+        """Count ``user``'s requests per direction and status in one aggregate."""
+        return self._format_counts(self.involving(user).aggregate(**self._count_aggregates(user)))
+    
+    async def astatus_counts(self, user):
+        return self._format_counts(await self.involving(user).aaggregate(**self._count_aggregates(user)))
+    
+    @staticmethod
+    def _count_aggregates(user):
+        aggregates = {}
+        for direction, field in (('sent', 'requester'), ('received', 'recipient')):
+            for code, _ in SwapRequest.STATUS_CHOICES:
+                aggregates[f'{direction}__{code}'] = Count('id', filter=Q(**{field: user, 'status': code}))
+        return aggregates
+    
+    @staticmethod
+    def _format_counts(totals):
+        counts = {'sent': {}, 'received': {}}
+        for key, value in totals.items():
+            direction, code = key.split('__')
+            counts[direction][code] = value
+        for direction in counts.values():
+            direction['total'] = sum(direction.values())
+        return counts
 
 
 class SwapRequest(models.Model):
+    """Request from one user to swap skills with another."""
+    
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('accepted', 'Accepted'),
         ('rejected', 'Rejected'),
+        ('completed', 'Completed'),
     ]
-    from_user = models.ForeignKey(User, related_name='sent_requests', on_delete=models.CASCADE)
-    to_user = models.ForeignKey(User, related_name='received_requests', on_delete=models.CASCADE)
-    skill = models.CharField(max_length=100)
+    
+    # Target status -> (status it must currently have, party allowed to move it)
+    TRANSITIONS = {
+        'accepted': ('pending', 'recipient'),
+        'rejected': ('pending', 'recipient'),
+        'completed': ('accepted', 'requester'),
+    }
+    
+    requester = models.ForeignKey(User, related_name='sent_requests', on_delete=models.CASCADE)
+    recipient = models.ForeignKey(User, related_name='received_requests', on_delete=models.CASCADE)
+    requested_skill = models.CharField(max_length=100)
+    offered_skill = models.CharField(max_length=100, blank=True)
+    message = models.TextField(blank=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
-
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = SwapRequestQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['requester', '-created_at', '-id'], name='swapreq_requester_created'),
+            models.Index(fields=['recipient', '-created_at', '-id'], name='swapreq_recipient_created'),
+            # Per-user status filters and the status_counts() aggregate
+            models.Index(fields=['requester', 'status', '-created_at'], name='swapreq_requester_status'),
+            models.Index(fields=['recipient', 'status', '-created_at'], name='swapreq_recipient_status'),
+            # The recipient's pending inbox, kept small by excluding settled requests
+            models.Index(
+                fields=['recipient', '-created_at', '-id'], name='swapreq_recipient_pending',
+                condition=Q(status='pending'),
+            ),
+        ]
+    
     def __str__(self):
-        return f"{self.from_user} → {self.to_user} ({self.skill})"
+        return f"{self.requester} → {self.recipient} ({self.requested_skill})"
+    
+    def can_transition(self, to_status, user):
+        """Whether ``user`` may move this request from its current status to ``to_status``."""
+        rule = self.TRANSITIONS.get(to_status)
+        if rule is None:
+            return False
+        from_status, actor = rule
+        return self.status == from_status and getattr(self, f'{actor}_id') == user.pk
 
 
 class SwapRating(models.Model):
@@ -42,12 +215,30 @@ class SwapRating(models.Model):
     
     class Meta:
         unique_together = ['swap_request', 'rater']
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['rater', '-created_at', '-id'], name='swaprating_rater_created'),
+            models.Index(fields=['rated_user', '-created_at', '-id'], name='swaprating_rated_created'),
+        ]
     
     def __str__(self):
         return f"{self.rater.email} rated {self.rated_user.email}: {self.rating}/5"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored score so edits only apply the difference
+        instance._loaded_rating = instance.__dict__.get('rating')
+        return instance
+    
     def save(self, *args, **kwargs):
         # Update the rated user's average rating
-        super().save(*args, **kwargs)
-        self.rated_user.update_rating(self.rating) 
\ No newline at end of file
+        adding = self._state.adding
+        previous = getattr(self, '_loaded_rating', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                User.adjust_rating(self.rated_user_id, self.rating, 1)
+            elif previous is not None and previous != self.rating:
+                User.adjust_rating(self.rated_user_id, self.rating - previous, 0)
+        self._loaded_rating = self.rating 
\ No newline at end of file
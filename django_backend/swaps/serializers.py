@@ -1,12 +1,19 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
 from .models import SwapRequest, SwapRating
-from users.serializers import UserSerializer
+from users.models import User
+from core import metrics
+from core.cache import invalidate_model
+from core.serializers import SparseFieldsetsMixin
+from users.serializers import UserSerializer, UserSummarySerializer
 
 
-class SwapRequestSerializer(serializers.ModelSerializer):
+class SwapRequestSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer for SwapRequest model."""
-    requester = UserSerializer(read_only=True)
-    recipient = UserSerializer(read_only=True)
+    requester = UserSummarySerializer(read_only=True)
+    recipient = UserSummarySerializer(read_only=True)
     
     class Meta:
         model = SwapRequest
@@ -15,6 +22,7 @@ class SwapRequestSerializer(serializers.ModelSerializer):
             'message', 'status', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'requester', 'created_at', 'updated_at']
+        expandable_fields = {'requester': UserSerializer, 'recipient': UserSerializer}
 
 
 class SwapRequestCreateSerializer(serializers.ModelSerializer):
@@ -31,17 +39,49 @@ class SwapRequestUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = SwapRequest
         fields = ['status']
+    
+    def validate_status(self, value):
+        user = self.context['request'].user
+        if self.instance is not None and value != self.instance.status and not self.instance.can_transition(value, user):
+            raise serializers.ValidationError(
+                f'Cannot change status from "{self.instance.status}" to "{value}".'
+            )
+        return value
+    
+    def update(self, instance, validated_data):
+        to_status = validated_data.get('status', instance.status)
+        if to_status == instance.status:
+            return instance
+        if not SwapRequest.objects.transition(instance.pk, to_status, self.context['request'].user):
+            raise serializers.ValidationError(
+                {'status': 'The swap request was changed by someone else; reload and try again.'}
+            )
+        instance.status = to_status
+        return instance
+
+
+class SwapRequestBulkTransitionSerializer(serializers.Serializer):
+    """Ids of swap requests and the status to move them all to."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=100
+    )
+    status = serializers.ChoiceField(choices=list(SwapRequest.TRANSITIONS))
+    
+    def validate_ids(self, value):
+        # Keep the caller's order but act on each id once
+        return list(dict.fromkeys(value))
 
 
-class SwapRatingSerializer(serializers.ModelSerializer):
+class SwapRatingSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer for SwapRating model."""
-    rater = UserSerializer(read_only=True)
-    rated_user = UserSerializer(read_only=True)
+    rater = UserSummarySerializer(read_only=True)
+    rated_user = UserSummarySerializer(read_only=True)
     
     class Meta:
         model = SwapRating
         fields = ['id', 'swap_request', 'rater', 'rated_user', 'rating', 'comment', 'created_at']
         read_only_fields = ['id', 'rater', 'created_at']
+        expandable_fields = {'rater': UserSerializer, 'rated_user': UserSerializer}
 
 
 class SwapRatingCreateSerializer(serializers.ModelSerializer):
@@ -49,4 +89,93 @@ class SwapRatingCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SwapRating
-        fields = ['swap_request', 'rated_user', 'rating', 'comment'] 
\ No newline at end of file
+        fields = ['swap_request', 'rated_user', 'rating', 'comment'] 
+
+
+class SwapRatingBulkListSerializer(serializers.ListSerializer):
+    """Validates and inserts a batch of ratings from one rater."""
+    
+    def __init__(self, *args, **kwargs):
+        # ListSerializer.__init__ sets both from kwargs, so class attributes would be overwritten
+        kwargs.setdefault('max_length', 100)
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+    
+    def run_validation(self, data=serializers.empty):
+        attrs = super().run_validation(data)
+        # Raised here rather than from validate() so errors stay aligned with the input list
+        errors = self.validate_batch(attrs)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+    
+    def validate_batch(self, attrs):
+        """Check every entry against prefetched swaps; return one error dict per entry."""
+        user = self.context['request'].user
+        swap_ids = {item['swap_request'] for item in attrs}
+        
+        # One query for the swaps, one for ratings this user already gave
+        swaps = (
+            SwapRequest.objects.filter(Q(requester=user) | Q(recipient=user), pk__in=swap_ids)
+            .select_related('requester', 'recipient')
+            .in_bulk()
+        )
+        already_rated = set(
+            SwapRating.objects.filter(rater=user, swap_request_id__in=swap_ids)
+            .values_list('swap_request_id', flat=True)
+        )
+        
+        errors = []
+        for item in attrs:
+            swap = swaps.get(item['swap_request'])
+            error = {}
+            if swap is None:
+                error['swap_request'] = ['Swap request not found.']
+            else:
+                other = swap.recipient if swap.requester_id == user.pk else swap.requester
+                if item['rated_user'] != other.pk:
+                    error['rated_user'] = ['You can only rate the other user in the swap.']
+                elif swap.pk in already_rated:
+                    error['swap_request'] = ['You have already rated this swap request.']
+                item['swap'] = swap
+                item['other'] = other
+                already_rated.add(swap.pk)
+            errors.append(error)
+        return errors
+    
+    def create(self, validated_data):
+        ratings = [
+            SwapRating(
+                swap_request=item['swap'],
+                rater=item['rater'],
+                rated_user=item['other'],
+                rating=item['rating'],
+                comment=item.get('comment', ''),
+            )
+            for item in validated_data
+        ]
+        
+        totals = defaultdict(lambda: [0, 0])
+        for rating in ratings:
+            totals[rating.rated_user_id][0] += rating.rating
+            totals[rating.rated_user_id][1] += 1
+        
+        with transaction.atomic():
+            # bulk_create skips SwapRating.save(), so aggregates are applied once per user here
+            SwapRating.objects.bulk_create(ratings)
+            for user_id, (rating_sum, rating_count) in totals.items():
+                User.adjust_rating(user_id, rating_sum, rating_count)
+            transaction.on_commit(lambda: invalidate_model(SwapRating))
+            transaction.on_commit(lambda: metrics.inc('skillswap_ratings_submitted_total', len(ratings)))
+        return ratings
+
+
+class SwapRatingBulkSerializer(serializers.Serializer):
+    """Serializer for one entry of a bulk rating upload."""
+    swap_request = serializers.IntegerField()
+    rated_user = serializers.IntegerField()
+    rating = serializers.ChoiceField(choices=[(i, i) for i in range(1, 6)])
+    comment = serializers.CharField(required=False, allow_blank=True)
+    
+    class Meta:
+        list_serializer_class = SwapRatingBulkListSerializer
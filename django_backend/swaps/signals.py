@@ -0,0 +1,24 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core import metrics
+from users.models import User
+from .models import SwapRating, SwapRequest
+
+
+@receiver(post_delete, sender=SwapRating)
+def remove_rating(sender, instance, **kwargs):
+    """Take a deleted rating back out of the rated user's aggregate."""
+    User.adjust_rating(instance.rated_user_id, -instance.rating, -1)
+
+
+@receiver(post_save, sender=SwapRequest)
+def count_swap_request(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: metrics.inc('skillswap_swaps_created_total'), using=using)
+
+
+@receiver(post_save, sender=SwapRating)
+def count_rating(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: metrics.inc('skillswap_ratings_submitted_total'), using=using)
@@ -0,0 +1,37 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import User
+from .models import SwapRating, SwapRequest
+
+
+class BulkCreateRatingsTests(APITestCase):
+    """Batch size limits of ``POST /api/swaps/ratings/bulk/``."""
+
+    def setUp(self):
+        self.rater = User.objects.create_user(username='rater', email='rater@example.com', password='pass')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='pass')
+        self.swap = SwapRequest.objects.create(
+            requester=self.rater, recipient=self.other, requested_skill='Python', status='completed'
+        )
+        self.client.force_authenticate(self.rater)
+        self.url = reverse('rating-bulk-create')
+
+    def entry(self):
+        return {'swap_request': self.swap.pk, 'rated_user': self.other.pk, 'rating': 5}
+
+    def test_rejects_more_than_100_entries(self):
+        response = self.client.post(self.url, [self.entry()] * 101, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', response.data)
+        self.assertFalse(SwapRating.objects.exists())
+
+    def test_rejects_empty_list(self):
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', response.data)
+
+    def test_accepts_single_entry(self):
+        response = self.client.post(self.url, [self.entry()], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SwapRating.objects.filter(rater=self.rater).count(), 1)
@@ -9,9 +9,11 @@ urlpatterns = [
     path('<int:pk>/accept/', views.accept_swap_request, name='accept-swap'),
     path('<int:pk>/reject/', views.reject_swap_request, name='reject-swap'),
     path('<int:pk>/complete/', views.complete_swap_request, name='complete-swap'),
+    path('bulk-transition/', views.bulk_transition_swap_requests, name='swap-bulk-transition'),
     
     # Swap ratings
     path('ratings/', views.SwapRatingListView.as_view(), name='rating-list'),
+    path('ratings/bulk/', views.bulk_create_ratings, name='rating-bulk-create'),
     path('ratings/<int:pk>/', views.SwapRatingDetailView.as_view(), name='rating-detail'),
     path('request/<int:user_id>/', views.create_swap_request, name='create_swap_request'),
 ] 
\ No newline at end of file
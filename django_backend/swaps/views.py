@@ -1,21 +1,27 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from django.db import IntegrityError
 from django.db.models import Q
+from core.conditional import condition, queryset_validators
+from core.pagination import OptionalKeysetPagination
 from .models import SwapRequest, SwapRating
 from .serializers import (
     SwapRequestSerializer, SwapRequestCreateSerializer, SwapRequestUpdateSerializer,
-    SwapRatingSerializer, SwapRatingCreateSerializer
+    SwapRequestBulkTransitionSerializer,
+    SwapRatingSerializer, SwapRatingCreateSerializer, SwapRatingBulkSerializer
 )
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.models import User
+from users.models import User
 
 
 class SwapRequestListView(generics.ListCreateAPIView):
     """List and create swap requests."""
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -24,9 +30,22 @@ class SwapRequestListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         user = self.request.user
-        return SwapRequest.objects.filter(
-            Q(requester=user) | Q(recipient=user)
-        )
+        
+        # Filter by direction
+        direction = self.request.query_params.get('direction', None)
+        if direction == 'sent':
+            queryset = SwapRequest.objects.filter(requester=user)
+        elif direction == 'received':
+            queryset = SwapRequest.objects.filter(recipient=user)
+        else:
+            queryset = SwapRequest.objects.filter(Q(requester=user) | Q(recipient=user))
+        
+        # Filter by status
+        status_filter = self.request.query_params.get('status', None)
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        
+        return queryset.select_related('requester', 'recipient')
     
     def perform_create(self, serializer):
         serializer.save(requester=self.request.user)
@@ -41,7 +60,7 @@ class SwapRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
         user = self.request.user
         return SwapRequest.objects.filter(
             Q(requester=user) | Q(recipient=user)
-        )
+        ).select_related('requester', 'recipient')
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -49,89 +68,122 @@ class SwapRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
         return SwapRequestSerializer
 
 
+def _page_param(params, name, default=1, maximum=None):
+    try:
+        value = max(int(params.get(name, default)), 1)
+    except (TypeError, ValueError):
+        value = default
+    return min(value, maximum) if maximum else value
+
+
+def swap_overview(user, params):
+    """Sent and received pages plus per-status counts, in two queries."""
+    page_size, sent_page, received_page = overview_pages(params)
+    sent, received = SwapRequest.objects.pages_by_direction(
+        user, sent_page=sent_page, received_page=received_page, page_size=page_size
+    )
+    counts = SwapRequest.objects.status_counts(user)
+    return sent, received, counts, overview_pagination(counts, page_size, sent_page, received_page)
+
+
+def overview_pages(params):
+    page_size = _page_param(params, 'page_size', api_settings.PAGE_SIZE, maximum=100)
+    return page_size, _page_param(params, 'sent_page'), _page_param(params, 'received_page')
+
+
+def overview_pagination(counts, page_size, sent_page, received_page):
+    return {
+        'sent': {
+            'page': sent_page,
+            'page_size': page_size,
+            'has_next': sent_page * page_size < counts['sent']['total'],
+        },
+        'received': {
+            'page': received_page,
+            'page_size': page_size,
+            'has_next': received_page * page_size < counts['received']['total'],
+        },
+    }
+
+
+# Both parties' summaries are embedded in every swap request
+OVERVIEW_RELATED_TIMESTAMPS = ('requester__updated_at', 'recipient__updated_at')
+
+
+def my_swap_requests_validators(request):
+    return queryset_validators(
+        request, SwapRequest.objects.involving(request.user), related=OVERVIEW_RELATED_TIMESTAMPS
+    )
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@condition(my_swap_requests_validators)
 def my_swap_requests(request):
     """Get current user's swap requests."""
-    user = request.user
-    
-    # Get requests sent by user
-    sent_requests = SwapRequest.objects.filter(requester=user)
-    sent_serializer = SwapRequestSerializer(sent_requests, many=True)
-    
-    # Get requests received by user
-    received_requests = SwapRequest.objects.filter(recipient=user)
-    received_serializer = SwapRequestSerializer(received_requests, many=True)
+    sent, received, counts, pagination = swap_overview(request.user, request.query_params)
+    context = {'request': request}
     
     return Response({
-        'sent_requests': sent_serializer.data,
-        'received_requests': received_serializer.data
+        'sent_requests': SwapRequestSerializer(sent, many=True, context=context).data,
+        'received_requests': SwapRequestSerializer(received, many=True, context=context).data,
+        'counts': counts,
+        'pagination': pagination,
     })
 
 
+def _transition_response(request, pk, to_status, message):
+    if SwapRequest.objects.transition(pk, to_status, request.user):
+        return Response({'message': message})
+    return Response(
+        {'error': f'Swap request not found or cannot be {to_status}'},
+        status=status.HTTP_404_NOT_FOUND
+    )
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def accept_swap_request(request, pk):
     """Accept a swap request."""
-    try:
-        swap_request = SwapRequest.objects.get(
-            id=pk, 
-            recipient=request.user, 
-            status='pending'
-        )
-        swap_request.status = 'accepted'
-        swap_request.save()
-        return Response({'message': 'Swap request accepted'})
-    except SwapRequest.DoesNotExist:
-        return Response(
-            {'error': 'Swap request not found or cannot be accepted'}, 
-            status=status.HTTP_404_NOT_FOUND
-        )
+    return _transition_response(request, pk, 'accepted', 'Swap request accepted')
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def reject_swap_request(request, pk):
     """Reject a swap request."""
-    try:
-        swap_request = SwapRequest.objects.get(
-            id=pk, 
-            recipient=request.user, 
-            status='pending'
-        )
-        swap_request.status = 'rejected'
-        swap_request.save()
-        return Response({'message': 'Swap request rejected'})
-    except SwapRequest.DoesNotExist:
-        return Response(
-            {'error': 'Swap request not found or cannot be rejected'}, 
-            status=status.HTTP_404_NOT_FOUND
-        )
+    return _transition_response(request, pk, 'rejected', 'Swap request rejected')
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def complete_swap_request(request, pk):
     """Mark a swap request as completed."""
-    try:
-        swap_request = SwapRequest.objects.get(
-            id=pk, 
-            status='accepted',
-            requester=request.user
-        )
-        swap_request.status = 'completed'
-        swap_request.save()
-        return Response({'message': 'Swap request marked as completed'})
-    except SwapRequest.DoesNotExist:
-        return Response(
-            {'error': 'Swap request not found or cannot be completed'}, 
-            status=status.HTTP_404_NOT_FOUND
-        )
+    return _transition_response(request, pk, 'completed', 'Swap request marked as completed')
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_transition_swap_requests(request):
+    """Accept, reject or complete many swap requests at once."""
+    serializer = SwapRequestBulkTransitionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    ids = serializer.validated_data['ids']
+    to_status = serializer.validated_data['status']
+    outcomes = SwapRequest.objects.transition_many(ids, to_status, request.user)
+    return Response({
+        'status': to_status,
+        'updated': sum(1 for outcome in outcomes.values() if outcome == 'updated'),
+        'results': [{'id': pk, 'result': outcomes[pk]} for pk in ids],
+    })
 
 
 class SwapRatingListView(generics.ListCreateAPIView):
     """List and create swap ratings."""
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -139,19 +191,43 @@ class SwapRatingListView(generics.ListCreateAPIView):
         return SwapRatingSerializer
     
     def get_queryset(self):
-        return SwapRating.objects.filter(rater=self.request.user)
+        # ?direction=received lists ratings about the user instead of by them
+        if self.request.query_params.get('direction') == 'received':
+            queryset = SwapRating.objects.filter(rated_user=self.request.user)
+        else:
+            queryset = SwapRating.objects.filter(rater=self.request.user)
+        return queryset.select_related('rater', 'rated_user')
     
     def perform_create(self, serializer):
         serializer.save(rater=self.request.user)
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_create_ratings(request):
+    """Create a batch of swap ratings in one transaction."""
+    serializer = SwapRatingBulkSerializer(data=request.data, many=True, context={'request': request})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        ratings = serializer.save(rater=request.user)
+    except IntegrityError:
+        return Response(
+            {'error': 'One or more of these swap requests has already been rated'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    data = SwapRatingSerializer(ratings, many=True, context={'request': request}).data
+    return Response(data, status=status.HTTP_201_CREATED)
+
+
 class SwapRatingDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Get, update, and delete specific swap rating."""
     serializer_class = SwapRatingSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return SwapRating.objects.filter(rater=self.request.user) 
+        return SwapRating.objects.filter(rater=self.request.user).select_related('rater', 'rated_user') 
 
 
 @login_required
@@ -161,9 +237,9 @@ def create_swap_request(request, user_id):
         skill = request.POST.get('skill')
         if skill:
             SwapRequest.objects.create(
-                from_user=request.user,
-                to_user=to_user,
-                skill=skill,
+                requester=request.user,
+                recipient=to_user,
+                requested_skill=skill,
             )
             messages.success(request, 'Skill Swap Request Sent!')
             return redirect('dashboard')
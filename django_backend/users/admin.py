@@ -9,12 +9,13 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ('role', 'is_active', 'is_available', 'created_at')
     search_fields = ('email', 'username', 'first_name', 'last_name')
     ordering = ('-created_at',)
+    readonly_fields = ('photo_variants',)
     
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Personal info', {'fields': ('username', 'first_name', 'last_name', 'location', 'bio')}),
         ('Skills', {'fields': ('skills_offered', 'skills_wanted')}),
-        ('Profile', {'fields': ('profile_photo', 'rating', 'rating_count', 'is_available')}),
+        ('Profile', {'fields': ('profile_photo', 'photo_variants', 'rating', 'rating_count', 'rating_sum', 'is_available')}),
         ('Permissions', {'fields': ('role', 'is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
         ('Important dates', {'fields': ('last_login', 'date_joined')}),
     )
@@ -0,0 +1,52 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from core.async_api import APIResponse, apaginate, async_api_view
+from core.cache import acached_render
+from core.conditional import aconditional_response, aqueryset_validators, make_etag
+from search.engine import flag_truncated, search_users
+from .authentication import CachedJWTAuthentication
+from .models import User
+from .serializers import UserSerializer
+from .views import filter_users
+
+
+@async_api_view(CachedJWTAuthentication)
+async def user_list(request):
+    """Async version of ``UserListView``."""
+    queryset = User.objects.exclude(id=request.user.id)
+    
+    search = request.query_params.get('search', None)
+    truncated = False
+    if search:
+        # The search backends run their index query eagerly through the sync ORM
+        queryset, truncated = await sync_to_async(search_users)(queryset, search)
+    queryset = filter_users(queryset, request.query_params, ordered=bool(search))
+    
+    async def render():
+        rows, envelope = await apaginate(request, queryset)
+        envelope['results'] = UserSerializer(rows, many=True, context={'request': request}).data
+        return APIResponse(flag_truncated(envelope, truncated))
+    
+    return await aconditional_response(request, lambda: aqueryset_validators(request, queryset), render)
+
+
+@async_api_view(CachedJWTAuthentication)
+async def user_detail(request, pk):
+    """Async version of ``UserDetailView``."""
+    async def get_validators():
+        updated_at = await User.objects.filter(pk=pk).values_list('updated_at', flat=True).afirst()
+        if updated_at is None:
+            return None
+        return make_etag(request, updated_at), updated_at
+    
+    async def render():
+        try:
+            user = await User.objects.aget(pk=pk)
+        except User.DoesNotExist:
+            raise Http404
+        return APIResponse(UserSerializer(user, context={'request': request}).data)
+    
+    return await aconditional_response(
+        request, get_validators,
+        lambda: acached_render(request, 'user-detail', 'shared', [User], render, APIResponse),
+    )
@@ -0,0 +1,124 @@
+import copy
+import threading
+import time
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """Small thread-safe TTL cache of user rows, local to this process."""
+    
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 30)
+    
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return entry[1]
+    
+    def set(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.maxsize and user_id not in self._entries:
+                # Drop the entry closest to expiry to make room
+                oldest = min(self._entries, key=lambda key: self._entries[key][0])
+                del self._entries[oldest]
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that resolves users through the in-process user cache."""
+    
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            user_cache.set(user_id, user)
+        return self._check_user(user, validated_token)
+    
+    async def aget_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            user_cache.set(user_id, user)
+        return self._check_user(user, validated_token)
+    
+    async def aauthenticate(self, request):
+        """Async ``authenticate`` for the ASGI views; only a cache miss hits the database."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+    
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+    
+    def _check_user(self, user, validated_token):
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        
+        # Hand each request its own copy so views can't mutate the cached one
+        return copy.copy(user)
+
+
+class TokenUserAuthentication(CachedJWTAuthentication):
+    """Opt-in authentication for views that only need the token claims.
+    
+    ``request.user`` is a ``TokenUser`` exposing ``id``/``pk`` from the token.
+    The account is still checked (active, password unchanged) against the
+    user cache, so only a cache miss reaches the database.
+    """
+    
+    def get_user(self, validated_token):
+        super().get_user(validated_token)
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+    
+    async def aget_user(self, validated_token):
+        await super().aget_user(validated_token)
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from users import thumbnails
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Generate resized profile photo variants, e.g. for photos uploaded before the pipeline existed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate variants that already exist')
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(profile_photo='').exclude(profile_photo__isnull=True)
+        done = 0
+        for user in users.only('id', 'profile_photo', 'photo_variants').order_by('id').iterator():
+            current = user.photo_variants or {}
+            if not options['all'] and current.get('source') == user.profile_photo.name:
+                continue
+            stale = current if current.get('source') else None
+            thumbnails.process(user.pk, user.profile_photo.name, stale)
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f'Generated photo variants for {done} users'))
@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding (and blacklisted) tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lt=now).order_by('id')
+        deleted = 0
+        while True:
+            # Small id batches keep each delete's lock short on a busy table
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            if options['pause']:
+                time.sleep(options['pause'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} expired tokens'))
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Now
 from django.core.validators import MinValueValidator, MaxValueValidator
+from core.cache import invalidate_model
 
 
 class User(AbstractUser):
@@ -16,6 +19,8 @@ class User(AbstractUser):
     location = models.CharField(max_length=100, blank=True)
     bio = models.TextField(blank=True)
     profile_photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True)
+    # Resized copies of profile_photo, written by users.thumbnails
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     rating = models.DecimalField(
         max_digits=3, 
         decimal_places=2, 
@@ -23,6 +28,7 @@ class User(AbstractUser):
         validators=[MinValueValidator(0), MaxValueValidator(5)]
     )
     rating_count = models.IntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
     skills_offered = models.JSONField(default=list, blank=True)
     skills_wanted = models.JSONField(default=list, blank=True)
     is_available = models.BooleanField(default=True)
@@ -35,6 +41,15 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored photo so saves can tell when a new one was uploaded
+        if 'profile_photo' in instance.__dict__:
+            instance._loaded_photo = instance.__dict__['profile_photo'] or None
+            instance._loaded_variants = instance.__dict__.get('photo_variants')
+        return instance
+    
     @property
     def average_rating(self):
         """Calculate average rating."""
@@ -44,14 +59,48 @@ class User(AbstractUser):
     
     def update_rating(self, new_rating):
         """Update user rating."""
-        total_rating = float(self.rating) * self.rating_count + new_rating
-        self.rating_count += 1
-        self.rating = total_rating / self.rating_count
-        self.save()
+        User.adjust_rating(self.pk, new_rating, 1)
+    
+    @classmethod
+    def adjust_rating(cls, user_id, rating_delta, count_delta):
+        """Apply a change to a user's running rating sum and count.
+        
+        Runs as one ``UPDATE ... SET`` touching only the rating columns (and
+        ``updated_at``, which HTTP validators rely on), so concurrent ratings
+        can't overwrite each other.
+        """
+        from .authentication import user_cache
+        
+        new_sum = F('rating_sum') + rating_delta
+        new_count = F('rating_count') + count_delta
+        # update() sends no post_save, so drop cached responses and the cached user explicitly
+        transaction.on_commit(lambda: (invalidate_model(cls), user_cache.invalidate(user_id)))
+        return cls.objects.filter(pk=user_id).update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            updated_at=Now(),
+            rating=Case(
+                When(rating_count__gt=-count_delta, then=Cast(new_sum, FloatField()) / new_count),
+                default=Value(0.0),
+                output_field=FloatField()
+            )
+        )
     
     class Meta:
         verbose_name = 'User'
-        verbose_name_plural = 'Users' 
+        verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='user_created_id'),
+            # Available users, newest first; partial so it stays small and is
+            # matched by the bare boolean WHERE clause Django emits
+            models.Index(
+                fields=['-created_at', '-id'], name='user_available_created',
+                condition=Q(is_available=True),
+            ),
+            # Lets the list ETag's MAX(updated_at)/COUNT read an index only
+            models.Index(fields=['updated_at'], name='user_updated'),
+        ]
+
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -0,0 +1,93 @@
+import threading
+import time
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+
+class RevocationSet:
+    """In-memory mirror of the token blacklist, keyed by JTI.
+    
+    The set is loaded from ``BlacklistedToken`` on first use and then topped up
+    incrementally (rows with an id above the watermark) at most every
+    ``TOKEN_REVOCATION_REFRESH`` seconds. Ids are allocated at insert but become
+    visible at commit, so a lower id can appear after a higher one; the
+    watermark therefore only passes rows blacklisted more than
+    ``TOKEN_REVOCATION_OVERLAP`` seconds ago, and newer ones are re-read on
+    every refresh until then. Tokens revoked in this process are
+    added immediately. Entries are dropped once the token has expired, since an
+    expired token is rejected before the blacklist is consulted.
+    """
+    
+    def __init__(self):
+        self._expiry = {}
+        self._watermark = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def interval(self):
+        return getattr(settings, 'TOKEN_REVOCATION_REFRESH', 5)
+    
+    @property
+    def overlap(self):
+        return getattr(settings, 'TOKEN_REVOCATION_OVERLAP', 60)
+    
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and self._watermark is not None and now - self._checked_at < self.interval:
+            return
+        with self._lock:
+            rows = BlacklistedToken.objects.order_by('id').values_list(
+                'id', 'blacklisted_at', 'token__jti', 'token__expires_at'
+            )
+            watermark = self._watermark or 0
+            rows = rows.filter(id__gt=watermark)
+            settled_before = time.time() - self.overlap
+            settled = True
+            for pk, blacklisted_at, jti, expires_at in rows:
+                self._expiry[jti] = expires_at.timestamp()
+                # Past the first recent row, lower ids may still be uncommitted
+                settled = settled and blacklisted_at.timestamp() < settled_before
+                if settled:
+                    watermark = pk
+            self._watermark = watermark
+            self._prune()
+            self._checked_at = now
+    
+    def _prune(self):
+        now = time.time()
+        for jti in [jti for jti, exp in self._expiry.items() if exp < now]:
+            del self._expiry[jti]
+    
+    def add(self, jti, exp):
+        with self._lock:
+            self._expiry[jti] = exp
+    
+    def is_revoked(self, jti):
+        self.refresh()
+        return jti in self._expiry
+    
+    def reset(self):
+        with self._lock:
+            self._expiry.clear()
+            self._watermark = None
+
+
+revoked_tokens = RevocationSet()
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token whose blacklist checks are served from ``revoked_tokens``."""
+    
+    def check_blacklist(self):
+        if revoked_tokens.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+    
+    def blacklist(self):
+        result = super().blacklist()
+        revoked_tokens.add(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+        return result
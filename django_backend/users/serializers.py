@@ -1,22 +1,57 @@
+from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from core.serializers import SparseFieldsetsMixin
 from .models import User
+from .revocation import RefreshToken
+from .thumbnails import variant_urls
 
 
-class UserSerializer(serializers.ModelSerializer):
+class PhotoVariantsField(serializers.Field):
+    """``{size: {format: url}}`` for the user's resized profile photos."""
+    
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, user):
+        urls = variant_urls(user)
+        request = self.context.get('request')
+        if request is None:
+            return urls
+        return {
+            name: {extension: request.build_absolute_uri(url) for extension, url in formats.items()}
+            for name, formats in urls.items()
+        }
+
+
+class UserSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer for User model."""
+    profile_photo_variants = PhotoVariantsField()
     
     class Meta:
         model = User
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
-            'role', 'location', 'bio', 'profile_photo', 'rating',
+            'role', 'location', 'bio', 'profile_photo', 'profile_photo_variants', 'rating',
             'rating_count', 'skills_offered', 'skills_wanted',
             'is_available', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'rating', 'rating_count', 'created_at', 'updated_at']
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact user representation for nesting in other payloads."""
+    profile_photo_variants = PhotoVariantsField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'profile_photo', 'profile_photo_variants', 'rating']
+        read_only_fields = fields
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
     password = serializers.CharField(write_only=True, min_length=6)
@@ -63,6 +98,25 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
-            'first_name', 'last_name', 'location', 'bio',
+            'first_name', 'last_name', 'location', 'bio', 'profile_photo',
             'skills_offered', 'skills_wanted', 'is_available'
-        ] 
\ No newline at end of file
+        ]
+    
+    def validate_profile_photo(self, value):
+        limit = settings.PROFILE_PHOTO_MAX_SIZE
+        if value and value.size > limit:
+            raise serializers.ValidationError(f'Profile photos can be at most {limit // (1024 * 1024)} MB.')
+        return value
+    
+    def update(self, instance, validated_data):
+        # Only write the submitted columns so rating aggregates updated
+        # concurrently by other requests are never overwritten
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance 
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Refresh serializer that checks and records revocations in memory."""
+    token_class = RefreshToken
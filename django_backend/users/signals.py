@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core import metrics
+from .authentication import user_cache
+from . import thumbnails
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, using=None, **kwargs):
+    """Drop the user from the auth cache so is_active/role changes apply promptly."""
+    user_cache.invalidate(instance.pk)
+    # Evict again after commit in case a request re-cached the old row meanwhile
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk), using=using)
+
+
+@receiver(post_save, sender=User)
+def count_registration(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: metrics.inc('skillswap_users_registered_total'), using=using)
+
+
+@receiver(post_save, sender=User)
+def refresh_photo_variants(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Queue new thumbnails when the profile photo changes."""
+    if raw or (update_fields is not None and 'profile_photo' not in update_fields):
+        return
+    if not created and not hasattr(instance, '_loaded_photo'):
+        # The photo column was deferred, so there is nothing to compare against
+        return
+    photo = instance.profile_photo.name or None
+    if photo == getattr(instance, '_loaded_photo', None):
+        return
+    previous = getattr(instance, '_loaded_variants', None)
+    instance._loaded_photo, instance._loaded_variants = photo, None
+    thumbnails.schedule(instance.pk, photo, previous)
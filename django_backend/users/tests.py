@@ -0,0 +1,44 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from .authentication import user_cache
+from .models import User
+
+
+class TokenUserAuthenticationTests(APITestCase):
+    """The stateless token path still rejects deactivated accounts."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pass')
+        self.authorization = f'Bearer {AccessToken.for_user(self.user)}'
+        self.addCleanup(user_cache.clear)
+
+    def test_active_user_is_accepted(self):
+        response = self.client.get(reverse('skill-list'), HTTP_AUTHORIZATION=self.authorization)
+        self.assertEqual(response.status_code, 200)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('skill-list'), HTTP_AUTHORIZATION=self.authorization)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_inactive_user_is_rejected_async(self):
+        await User.objects.filter(pk=self.user.pk).aupdate(is_active=False)
+        user_cache.invalidate(self.user.pk)
+        response = await self.async_client.get(
+            reverse('async-skill-list'), headers={'authorization': self.authorization}
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class AdjustRatingTests(TestCase):
+
+    def test_evicts_cached_user(self):
+        user = User.objects.create_user(username='rated', email='rated@example.com', password='pass')
+        user_cache.set(user.pk, user)
+        self.addCleanup(user_cache.clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.adjust_rating(user.pk, 4, 1)
+        self.assertIsNone(user_cache.get(user.pk))
@@ -0,0 +1,169 @@
+"""
+Resized variants of ``User.profile_photo``.
+
+Lists serve avatars at a few fixed sizes. Each size is re-encoded as WebP
+plus a JPEG fallback by a small thread pool after the upload has committed,
+so the request that stores the photo never waits on image processing. The
+result is recorded in ``User.photo_variants``::
+
+    {'source': 'profile_photos/me.png',
+     'small': {'webp': 'profile_photos/variants/7/me-small.webp', 'jpeg': ...},
+     'medium': {...}}
+
+``source`` ties the variants to the upload they were cut from, so a newer
+photo never shows an older photo's thumbnails.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models.functions import Now
+from PIL import Image, ImageOps, UnidentifiedImageError
+from core.cache import invalidate_model
+
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> square edge in pixels
+DEFAULT_VARIANTS = {'small': 64, 'medium': 256}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def variant_sizes():
+    return getattr(settings, 'PROFILE_PHOTO_VARIANTS', DEFAULT_VARIANTS)
+
+
+def get_executor():
+    """The process's worker pool, recreated after a fork (threads don't survive one)."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor_pid != pid:
+        with _executor_lock:
+            if _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'THUMBNAIL_WORKERS', 2),
+                    thread_name_prefix='thumbnails',
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def schedule(user_id, source, previous=None):
+    """Generate variants of ``source`` for ``user_id`` once the current transaction commits."""
+    def submit():
+        if getattr(settings, 'THUMBNAIL_WORKERS', 2) <= 0:
+            process(user_id, source, previous)
+        else:
+            get_executor().submit(_work, user_id, source, previous)
+    transaction.on_commit(submit)
+
+
+def process(user_id, source, previous=None):
+    """Build the variants for ``source``, store them, then drop the ``previous`` files."""
+    try:
+        if source:
+            variants = build_variants(user_id, source)
+            if not save_variants(user_id, source, variants):
+                # The photo changed while we worked; the newer upload has its own job
+                delete_files(variants)
+        if previous:
+            delete_files(previous)
+    except Exception:
+        logger.exception('Could not generate photo variants for user %s', user_id)
+
+
+def _work(user_id, source, previous):
+    try:
+        process(user_id, source, previous)
+    finally:
+        # Pool threads outlive requests, so release their connection like a request would
+        close_old_connections()
+
+
+def build_variants(user_id, source):
+    """Write every size/format of ``source`` to storage and return the variant map."""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    variants = {'source': source}
+    try:
+        with default_storage.open(source, 'rb') as handle:
+            image = load_image(handle, max(variant_sizes().values()))
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        logger.warning('Skipping unreadable profile photo %s: %s', source, exc)
+        return variants
+
+    for name, edge in variant_sizes().items():
+        resized = ImageOps.fit(image, (edge, edge), Image.LANCZOS)
+        variants[name] = {}
+        for extension, (fmt, options) in FORMATS.items():
+            frame = resized if fmt == 'WEBP' or resized.mode == 'RGB' else flatten(resized)
+            buffer = io.BytesIO()
+            frame.save(buffer, fmt, **options)
+            path = f'profile_photos/variants/{user_id}/{stem}-{name}.{extension}'
+            variants[name][extension] = default_storage.save(path, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def load_image(handle, edge):
+    """Decode only as much of the image as the largest variant needs."""
+    image = Image.open(handle)
+    # JPEG can decode straight to a smaller scale, skipping the full-size bitmap
+    image.draft('RGB', (edge * 2, edge * 2))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    return image
+
+
+def flatten(image):
+    """Composite a transparent image onto white for formats without alpha."""
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def save_variants(user_id, source, variants):
+    """Store ``variants`` unless the user's photo is no longer ``source``."""
+    from .authentication import user_cache
+    from .models import User
+
+    # Bump updated_at too, which the list/detail ETags are built from
+    updated = User.objects.filter(pk=user_id, profile_photo=source).update(
+        photo_variants=variants, updated_at=Now()
+    )
+    if updated:
+        # update() sends no post_save, so evict the cached copies here
+        user_cache.invalidate(user_id)
+        invalidate_model(User)
+    return bool(updated)
+
+
+def delete_files(variants):
+    for name, formats in variants.items():
+        if name == 'source':
+            continue
+        for path in formats.values():
+            default_storage.delete(path)
+
+
+def variant_urls(user):
+    """``{size: {format: url}}`` for the user's current photo, or ``{}`` until they exist."""
+    variants = user.photo_variants or {}
+    if not user.profile_photo or variants.get('source') != user.profile_photo.name:
+        return {}
+    return {
+        name: {extension: default_storage.url(path) for extension, path in formats.items()}
+        for name, formats in variants.items() if name != 'source'
+    }
@@ -2,10 +2,11 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.db.models import Q
+from core.pagination import OptionalKeysetPagination
 from .models import User
+from .revocation import RefreshToken
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, UserLoginSerializer,
     UserProfileUpdateSerializer
@@ -16,11 +17,14 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms import UserRegisterForm, ProfileForm, LoginForm
 from .models import Profile
-from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.http import HttpResponseRedirect
-from swaps.models import SwapRequest
+from swaps.views import swap_overview
+from skills.models import UserSkill
+from search.engine import flag_truncated, search_users
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin, make_etag
 
 
 @receiver(post_save, sender=User)
@@ -94,50 +98,68 @@ class UserProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(ConditionalGetMixin, generics.ListAPIView):
     """List all users with search and filtering."""
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
+    search_truncated = False
     
     def get_queryset(self):
         queryset = User.objects.exclude(id=self.request.user.id)
         
-        # Search by name or email
+        # Full-text search over name, email, bio, location and skills
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(email__icontains=search)
-            )
+            queryset, self.search_truncated = search_users(queryset, search)
         
-        # Filter by skill
-        skill = self.request.query_params.get('skill', None)
-        if skill:
-            queryset = queryset.filter(
-                Q(skills_offered__icontains=skill) |
-                Q(skills_wanted__icontains=skill)
-            )
-        
-        # Filter by location
-        location = self.request.query_params.get('location', None)
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        
-        # Filter by availability
-        available = self.request.query_params.get('available', None)
-        if available is not None:
-            available = available.lower() == 'true'
-            queryset = queryset.filter(is_available=available)
-        
-        return queryset.order_by('-created_at')
+        return filter_users(queryset, self.request.query_params, ordered=bool(search))
+    
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        flag_truncated(response.data, self.search_truncated)
+        return response
+
+
+def filter_users(queryset, params, ordered=False):
+    """Apply the user list's skill/location/availability filters and ordering."""
+    # Filter by skill
+    skill = params.get('skill', None)
+    if skill:
+        queryset = queryset.filter(
+            id__in=UserSkill.objects.matching(skill).values('user_id')
+        )
+    
+    # Filter by location
+    location = params.get('location', None)
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    
+    # Filter by availability
+    available = params.get('available', None)
+    if available is not None:
+        available = available.lower() == 'true'
+        queryset = queryset.filter(is_available=available)
+    
+    if ordered:
+        # Already ordered by relevance
+        return queryset
+    return queryset.order_by('-created_at', '-id')
 
 
-class UserDetailView(generics.RetrieveAPIView):
+class UserDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
     """Get specific user details."""
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     queryset = User.objects.all()
+    cache_name = 'user-detail'
+    cache_depends_on = [User]
+    
+    def get_validators(self):
+        updated_at = User.objects.filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return make_etag(self.request, updated_at), updated_at
 
 
 @api_view(['GET'])
@@ -220,9 +242,10 @@ def browse_skills(request):
 
 @login_required
 def dashboard_view(request):
-    sent_requests = SwapRequest.objects.filter(from_user=request.user)
-    received_requests = SwapRequest.objects.filter(to_user=request.user)
+    sent_requests, received_requests, counts, pagination = swap_overview(request.user, request.GET)
     return render(request, 'users/dashboard.html', {
         'sent_requests': sent_requests,
         'received_requests': received_requests,
+        'counts': counts,
+        'pagination': pagination,
     }) 
\ No newline at end of file